@@ -1,4 +1,6 @@
 import argparse
+import contextlib
+import functools
 import os
 
 from service.commands import (
@@ -8,23 +10,40 @@ from service.commands import (
     DeleteSpeakerCommand,
     CommandHandler
 )
-from file_management.bst import BinarySearchTree
+from file_management.file_index import DEFAULT_FILE_INDEX, FILE_INDEX_TYPES, open_file_index
 from file_management.file_management import FileManagementInterface
 
 def setup_environment(base_directory):
     # Ensure the base directory for models, audio files, and metadata exists
-    if not os.path.exists(os.path.join(base_directory, "models")):
-        os.makedirs(os.path.join(base_directory, "models"))
-    if not os.path.exists(os.path.join(base_directory, "audio_files")):
-        os.makedirs(os.path.join(base_directory, "audio_files"))
-    if not os.path.exists(os.path.join(base_directory, "metadata")):
-        os.makedirs(os.path.join(base_directory, "metadata"))
+    for subdirectory in ("models", "audio_files", "metadata"):
+        os.makedirs(os.path.join(base_directory, subdirectory), exist_ok=True)
     print(f"Environment set up at {base_directory}")
 
-def main(command_line_args=None):
-    """CLI entry point."""
+@contextlib.contextmanager
+def bst_session(file_index=DEFAULT_FILE_INDEX):
+    """
+    Load the BST once for a CLI invocation and save it once on exit if it changed.
+
+    Read-only commands leave the BST clean, so they never rewrite the data file.
+
+    Args:
+        file_index (str): The index implementation to load (see open_file_index).
+
+    Yields:
+        BinarySearchTree or SortedFileIndex: The index loaded from the default data file.
+    """
+    bst = open_file_index(file_index)
+    yield bst
+    if bst.dirty:
+        bst.serialize_bst()
+
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the argument parser once and reuse it for every call to main()."""
     # Initialize Argument Parser
     parser = argparse.ArgumentParser(description="Speaker Recognition CLI Tool")
+    parser.add_argument('--file_index', choices=sorted(FILE_INDEX_TYPES), default=DEFAULT_FILE_INDEX,
+                        help='File metadata index implementation')
 
     # Create subparsers for different commands
     subparsers = parser.add_subparsers(dest='command')
@@ -52,6 +71,8 @@ def main(command_line_args=None):
     recognize_parser.add_argument('--fft_size', type=int, default=512, help='FFT size for audio processing')
     recognize_parser.add_argument('--num_filters', type=int, default=26, help='Number of Mel filters')
     recognize_parser.add_argument('--num_ceps', type=int, default=13, help='Number of MFCC coefficients')
+    recognize_parser.add_argument('--max_frames', type=int, default=None,
+                                  help='Score at most this many randomly drawn frames (default: all)')
 
     # List Speakers Command
     subparsers.add_parser('list_speakers', help='List all enrolled speakers')
@@ -60,7 +81,12 @@ def main(command_line_args=None):
     delete_parser = subparsers.add_parser('delete_speaker', help='Delete a speaker by name')
     delete_parser.add_argument('speaker_name', type=str, help='Name of the speaker to delete')
 
+    return parser
+
+def main(command_line_args=None):
+    """CLI entry point."""
     # Parse the arguments
+    parser = _build_parser()
     args = parser.parse_args(command_line_args)
 
     # Initialize the command handler
@@ -72,55 +98,52 @@ def main(command_line_args=None):
     # Ensure environment setup
     setup_environment(base_directory)
 
-    # Initialize Binary Search Tree
-    bst = BinarySearchTree()  # Placeholder for actual binary search tree implementation
-
-    # Process the command based on the parsed arguments
-    if args.command == 'enroll':
-        command = EnrollSpeakerCommand(
-            speaker_name=args.speaker_name,
-            audio_file=args.audio_file,
-            bst=bst,
-            base_directory=base_directory,
-            sample_rate=args.sample_rate,
-            num_filters=args.num_filters,
-            num_ceps=args.num_ceps,
-            n_fft=args.n_fft,
-            frame_size=args.frame_size,
-            frame_step=args.frame_step,
-            n_mixtures=args.n_mixtures
-        )
-        handler.run(command)
-        
-        # Serialize the BST before exiting the program
-        bst.serialize_bst()
-
-    elif args.command == 'recognize':
-        command = RecognizeSpeakerCommand(
-            bst=bst,
-            audio_file=args.audio_file,
-            base_directory=base_directory,
-            sample_rate=args.sample_rate,
-            frame_size=args.frame_size,
-            frame_step=args.frame_step,
-            fft_size=args.fft_size,
-            num_filters=args.num_filters,
-            num_ceps=args.num_ceps
-        )
-        handler.run(command)
-
-    elif args.command == 'list_speakers':
-        file_management = FileManagementInterface(bst=bst, base_directory=base_directory)
-        command = ListSpeakersCommand(file_management)
-        handler.run(command)
-
-    elif args.command == 'delete_speaker':
-        file_management = FileManagementInterface(bst=bst, base_directory=base_directory)
-        command = DeleteSpeakerCommand(args.speaker_name, file_management)
-        handler.run(command)
-
-    else:
-        parser.print_help()
+    # Load the BST once; it is saved on exit only if the command changed it
+    with bst_session(args.file_index) as bst:
+        # Process the command based on the parsed arguments
+        if args.command == 'enroll':
+            command = EnrollSpeakerCommand(
+                speaker_name=args.speaker_name,
+                audio_file=args.audio_file,
+                bst=bst,
+                base_directory=base_directory,
+                sample_rate=args.sample_rate,
+                num_filters=args.num_filters,
+                num_ceps=args.num_ceps,
+                n_fft=args.n_fft,
+                frame_size=args.frame_size,
+                frame_step=args.frame_step,
+                n_mixtures=args.n_mixtures
+            )
+            handler.run(command)
+
+        elif args.command == 'recognize':
+            command = RecognizeSpeakerCommand(
+                bst=bst,
+                audio_file=args.audio_file,
+                base_directory=base_directory,
+                sample_rate=args.sample_rate,
+                frame_size=args.frame_size,
+                frame_step=args.frame_step,
+                fft_size=args.fft_size,
+                num_filters=args.num_filters,
+                num_ceps=args.num_ceps,
+                max_frames=args.max_frames
+            )
+            handler.run(command)
+
+        elif args.command == 'list_speakers':
+            file_management = FileManagementInterface(bst=bst, base_directory=base_directory)
+            command = ListSpeakersCommand(file_management)
+            handler.run(command)
+
+        elif args.command == 'delete_speaker':
+            file_management = FileManagementInterface(bst=bst, base_directory=base_directory)
+            command = DeleteSpeakerCommand(args.speaker_name, file_management)
+            handler.run(command)
+
+        else:
+            parser.print_help()
 
 if __name__ == "__main__":
     #debug_args = [
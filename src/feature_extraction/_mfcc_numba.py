@@ -0,0 +1,105 @@
+# Numba kernels for the per-frame stages of the MFCC pipeline.
+#
+# Pre-emphasis, framing and windowing are fused into a single pass over the signal that
+# writes the windowed frames directly into the output buffer, in parallel across frames.
+# The FFT, Mel and DCT stages are not part of the kernel: Numba does not support np.fft,
+# and the Mel/DCT projections are already single BLAS calls. A per-frame kernel fusing
+# |X|^2, a sparse Mel projection (only the non-zero band of each triangular filter),
+# the log and the DCT was tried on 1000 frames of 512-point FFT output and took ~690 us
+# against ~490 us for compute_mel_from_fft + LogarithmCompression + the DCT matmul, so
+# the spectral stages stay on scipy.fft and BLAS.
+#
+# Numba is optional. When it is not installed, the kernels are None and the callers fall
+# back to their NumPy implementations.
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _emphasize_frame_window(signal, window, frame_step, num_frames, alpha, out, remove_dc=False):
+    """
+    Pre-emphasize, frame and window the signal in a single pass.
+
+    Samples past the end of the signal are treated as zero padding, exactly as if the
+    pre-emphasized signal had been padded before framing.
+
+    Args:
+        signal (np.ndarray): The raw audio signal (float32).
+        window (np.ndarray): The window applied to every frame (float32).
+        frame_step (int): The number of samples between successive frames.
+        num_frames (int): The number of frames to produce.
+        alpha (float): The pre-emphasis coefficient.
+        out (np.ndarray): Output buffer (shape: [num_frames, len(window)]).
+        remove_dc (bool): Subtract each frame's mean before windowing it.
+
+    Returns:
+        np.ndarray: The output buffer holding the windowed frames.
+    """
+    signal_length = signal.shape[0]
+    frame_length = window.shape[0]
+    for i in prange(num_frames):
+        base = i * frame_step
+        for j in range(frame_length):
+            t = base + j
+            if t >= signal_length:
+                out[i, j] = 0.0
+            elif t == 0:
+                out[i, j] = signal[0]
+            else:
+                out[i, j] = signal[t] - alpha * signal[t - 1]
+        # The frame row is still in cache, so the mean and the window cost no extra pass
+        # over memory
+        mean = 0.0
+        if remove_dc:
+            for j in range(frame_length):
+                mean += out[i, j]
+            mean /= frame_length
+        for j in range(frame_length):
+            out[i, j] = (out[i, j] - mean) * window[j]
+    return out
+
+
+def _frame_window(signal, window, frame_step, num_frames, out, remove_dc=False):
+    """
+    Frame and window the signal in a single pass.
+
+    Samples past the end of the signal are treated as zero padding.
+
+    Args:
+        signal (np.ndarray): The audio signal (float32).
+        window (np.ndarray): The window applied to every frame (float32).
+        frame_step (int): The number of samples between successive frames.
+        num_frames (int): The number of frames to produce.
+        out (np.ndarray): Output buffer (shape: [num_frames, len(window)]).
+        remove_dc (bool): Subtract each frame's mean before windowing it.
+
+    Returns:
+        np.ndarray: The output buffer holding the windowed frames.
+    """
+    signal_length = signal.shape[0]
+    frame_length = window.shape[0]
+    for i in prange(num_frames):
+        base = i * frame_step
+        mean = 0.0
+        if remove_dc:
+            for t in range(base, min(base + frame_length, signal_length)):
+                mean += signal[t]
+            mean /= frame_length
+        for j in range(frame_length):
+            t = base + j
+            if t >= signal_length:
+                out[i, j] = -mean * window[j]
+            else:
+                out[i, j] = (signal[t] - mean) * window[j]
+    return out
+
+
+if njit is not None:
+    emphasize_frame_window = njit(parallel=True, fastmath=True, cache=True)(_emphasize_frame_window)
+    frame_window = njit(parallel=True, fastmath=True, cache=True)(_frame_window)
+else:
+    emphasize_frame_window = None
+    frame_window = None
@@ -0,0 +1,92 @@
+# PyTorch implementation of the spectral stages of the MFCC pipeline, used to offload long
+# signals to a CUDA device.
+#
+# The stages mirror the NumPy path exactly (rfft -> |X|^2 -> Mel projection -> log -> DCT
+# projection, with the same filterbank, epsilon and DCT basis), so features computed on the
+# GPU are interchangeable with CPU features and with GMMs trained on either. torchaudio's
+# MFCC transform is not used because its framing, padding and log differ from this pipeline.
+#
+# PyTorch is optional and heavy to import, so it is only imported the first time a caller
+# asks for the CUDA stages. When it is not installed, or no CUDA device is available,
+# load_cuda_stages returns None and the feature extractor stays on the CPU.
+
+import functools
+
+import numpy as np
+
+
+@functools.lru_cache(maxsize=1)
+def _import_torch():
+    """
+    Import PyTorch if it is installed and a CUDA device is available.
+
+    Returns:
+        module or None: The torch module, or None when CUDA cannot be used.
+    """
+    try:
+        import torch
+    except ImportError:
+        return None
+    if not torch.cuda.is_available():
+        return None
+    return torch
+
+
+class CudaSpectralStages:
+    def __init__(self, torch, fft_size, mel_filterbank, dct_basis, epsilon):
+        """
+        Upload the constant Mel and DCT tables to the CUDA device.
+
+        Args:
+            torch (module): The torch module.
+            fft_size (int): The size of the FFT.
+            mel_filterbank (np.ndarray): The Mel filterbank (shape: [num_filters, fft_size // 2 + 1]).
+            dct_basis (np.ndarray): The DCT basis (shape: [num_ceps, num_filters]).
+            epsilon (float): The value added before taking the logarithm.
+        """
+        self._torch = torch
+        self.fft_size = fft_size
+        self.epsilon = epsilon
+        self.device = torch.device('cuda')
+        # Store the transposed tables so both projections are plain right-multiplications
+        self._mel_t = torch.from_numpy(np.array(mel_filterbank.T, dtype=np.float32)).to(self.device)
+        self._dct_t = torch.from_numpy(np.array(dct_basis.T, dtype=np.float32)).to(self.device)
+
+    def compute_mfcc(self, frames):
+        """
+        Compute the MFCCs of windowed frames on the CUDA device.
+
+        Args:
+            frames (np.ndarray): The windowed frames (float32, shape: [num_frames, frame_length]).
+
+        Returns:
+            np.ndarray: The MFCC features (float32, shape: [num_frames, num_ceps]).
+        """
+        torch = self._torch
+        with torch.no_grad():
+            x = torch.from_numpy(frames).to(self.device, non_blocking=True)
+            spectrum = torch.fft.rfft(x, n=self.fft_size, dim=-1)
+            power = spectrum.abs().square_()
+            mel = power @ self._mel_t
+            mel.add_(self.epsilon).log_()
+            mfcc = mel @ self._dct_t
+        return mfcc.cpu().numpy()
+
+
+def load_cuda_stages(fft_size, mel_filterbank, dct_basis, epsilon):
+    """
+    Build the CUDA spectral stages if PyTorch and a CUDA device are available.
+
+    Args:
+        fft_size (int): The size of the FFT.
+        mel_filterbank (np.ndarray): The Mel filterbank.
+        dct_basis (np.ndarray): The DCT basis.
+        epsilon (float): The value added before taking the logarithm.
+
+    Returns:
+        CudaSpectralStages or None: The CUDA stages, or None when CUDA cannot be used.
+    """
+    torch = _import_torch()
+    if torch is None:
+        return None
+    return CudaSpectralStages(torch, fft_size, mel_filterbank, dct_basis, epsilon)
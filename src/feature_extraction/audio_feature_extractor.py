@@ -1,15 +1,52 @@
+import contextlib
+import functools
+import os
+from math import gcd
 import numpy as np
-import matplotlib.pyplot as plt
-import librosa
+import soundfile as sf
 from feature_extraction.pre_emphasis import PreEmphasisFilter
-from feature_extraction.framing import Framing
+from feature_extraction.framing import Framing, aligned_empty, copy_frames
 from feature_extraction.hamming_window import HammingWindow
-from feature_extraction.fft import FFTProcessor
+from feature_extraction.fft import FFTProcessor, MEL_BLOCK_FRAMES
 from feature_extraction.mel_filterbank import MelScaleFilterbank
 from feature_extraction.dct_processor import DCTProcessor, LogarithmCompression
+from feature_extraction._mfcc_numba import emphasize_frame_window
+from feature_extraction._mfcc_torch import load_cuda_stages
+
+# Signals at least this long (in seconds) are offloaded to a CUDA device when one is available;
+# shorter signals do not amortize the host-to-device transfer
+CUDA_MIN_SECONDS = 5.0
+
+
+@contextlib.contextmanager
+def _open_for_single_pass(filepath):
+    """
+    Open a file that is read once from start to end, for soundfile to decode.
+
+    Where the platform supports it, the kernel is told the access is sequential, so it
+    reads ahead aggressively, and the file's pages are dropped from the page cache once
+    it is closed, so a recording decoded once does not evict pages that are reused
+    (models, the file index).
+
+    Args:
+        filepath (str): The path to the file.
+
+    Yields:
+        int: A file descriptor open for reading; it is closed on exit.
+    """
+    fd = os.open(filepath, os.O_RDONLY)
+    try:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        yield fd
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
 
 class AudioFeatureExtractor:
-    def __init__(self, sample_rate=16000, frame_size=0.025, frame_step=0.01, fft_size=512, num_filters=26, num_ceps=13):
+    def __init__(self, sample_rate=16000, frame_size=0.025, frame_step=0.01, fft_size=512, num_filters=26, num_ceps=13,
+                 use_cuda=True, remove_dc=False):
         """
         Initialize the feature extractor with default parameters for MFCC feature extraction.
 
@@ -20,6 +57,10 @@ class AudioFeatureExtractor:
             fft_size (int): The size of the FFT (number of frequency bins).
             num_filters (int): The number of filters in the Mel filterbank.
             num_ceps (int): The number of MFCC coefficients to retain.
+            use_cuda (bool): Compute the spectral stages of long signals on a CUDA device
+                             when PyTorch and a device are available.
+            remove_dc (bool): Subtract each frame's mean (DC offset) before windowing. Off by
+                              default, since it changes the features GMMs were trained on.
         """
         self.sample_rate = sample_rate
         self.frame_size = frame_size
@@ -27,16 +68,73 @@ class AudioFeatureExtractor:
         self.fft_size = fft_size
         self.num_filters = num_filters
         self.num_ceps = num_ceps
+        self.remove_dc = remove_dc
 
         # Initialize all processing components
         self.pre_emphasis_filter = PreEmphasisFilter()
         self.framing = Framing(self.frame_size, self.frame_step, self.sample_rate)
-        self.hamming_window = HammingWindow(int(self.frame_size * self.sample_rate))
         self.fft_processor = FFTProcessor(self.fft_size)
         self.mel_filterbank = MelScaleFilterbank(self.sample_rate, self.num_filters, self.fft_size)
-        self.dct_processor = DCTProcessor(self.num_ceps)
+        self.dct_processor = DCTProcessor(self.num_ceps, self.num_filters)
         self.log_compressor = LogarithmCompression()
 
+        # Precompute the constant matrices used by the fused pipeline
+        self._frame_length = int(self.frame_size * self.sample_rate)
+        self._frame_step = int(self.frame_step * self.sample_rate)
+        self._window = HammingWindow(self._frame_length).hamming_window
+        self._mel = self.mel_filterbank.filterbank
+        # The Mel filterbank is applied as a sparse product when it is sparse enough to pay off
+        self._mel_projection = self.mel_filterbank.filterbank_sparse
+        if self._mel_projection is None:
+            self._mel_projection = self._mel
+        self._dct = self.dct_processor.basis
+
+        # The tables are shared by every user of a cached extractor (see get), so make them read-only
+        for table in (self._window, self._mel, self._dct):
+            table.flags.writeable = False
+
+        # CUDA spectral stages, loaded on the first signal long enough to use them
+        self.use_cuda = use_cuda
+        self._cuda_min_frames = int(CUDA_MIN_SECONDS / self.frame_step)
+        self._cuda_stages = None
+        self._cuda_loaded = False
+
+        # Per-block power spectrum scratch (see compute_mel_from_fft), shared by the offline
+        # and streaming paths, and the Mel spectrum buffer reused by extract_features
+        self._power_buf = np.empty((MEL_BLOCK_FRAMES, self.fft_size // 2 + 1), dtype=np.float32)
+        self._mel_spectrum_buf = np.empty((0, self._mel.shape[0]), dtype=np.float32)
+
+        # Buffers and state carried between calls to extract_features_stream
+        self._tail = np.empty(0, dtype=np.float32)
+        self._frame_buf = np.empty((0, self._frame_length), dtype=np.float32)
+        self._mel_buf = np.empty((0, self._mel.shape[0]), dtype=np.float32)
+        self._mfcc_buf = np.empty((0, self._dct.shape[0]), dtype=np.float32)
+        self.reset_stream()
+
+    @classmethod
+    def get(cls, sample_rate=16000, frame_size=0.025, frame_step=0.01, fft_size=512, num_filters=26, num_ceps=13):
+        """
+        Return a shared feature extractor for the given parameters.
+
+        Building an extractor computes the window, Mel filterbank and DCT tables, so
+        extractors are cached and reused across commands with the same parameters.
+        The cached instance keeps scratch buffers and streaming state, so it must be
+        used from one thread at a time; callers of extract_features_stream should
+        construct their own instance.
+
+        Args:
+            sample_rate (int): The sampling rate of the audio signal.
+            frame_size (float): Frame size in seconds.
+            frame_step (float): Frame step (overlap) in seconds.
+            fft_size (int): The size of the FFT (number of frequency bins).
+            num_filters (int): The number of filters in the Mel filterbank.
+            num_ceps (int): The number of MFCC coefficients to retain.
+
+        Returns:
+            AudioFeatureExtractor: The cached extractor.
+        """
+        return _extractor_cached(cls, sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps)
+
     def extract_features(self, signal):
         """
         Extract MFCC features from a given audio signal.
@@ -46,99 +144,350 @@ class AudioFeatureExtractor:
         Returns:
             np.ndarray: The MFCC features extracted from the audio signal.
         """
-        # Step 1: Apply pre-emphasis filter
-        pre_emphasized_signal = self.pre_emphasis_filter.apply_filter(signal)
-        
-        # Step 2: Frame the signal
-        frames = self.framing.frame_signal(pre_emphasized_signal)
-        
-        # Step 3: Apply Hamming window
-        windowed_frames = self.hamming_window.apply(frames)
-        
-        # Step 4: Compute FFT
-        fft_result = self.fft_processor.compute_fft(windowed_frames)
-        
-        # Step 5: Compute power spectrum
-        power_spectrum = self.fft_processor.compute_power_spectrum(fft_result)
-        
-        # Step 6: Apply Mel filterbank
-        mel_spectrum = self.mel_filterbank.apply(power_spectrum)
-        
-        # Step 7: Apply logarithm compression
+        # Step 1-3: Apply pre-emphasis filter, frame the signal and apply the Hamming window
+        frames = self._emphasize_and_frame(signal)
+
+        # Step 4-8: Compute the MFCCs of the frames
+        return self._compute_mfcc(frames)
+
+    def extract_features_batch(self, signals):
+        """
+        Extract MFCC features from several audio signals at once.
+
+        The frames of all signals are written into one buffer so that the FFT, Mel and
+        DCT stages each run once over every frame, instead of once per signal with
+        small matrices. The result is split back per signal.
+
+        Args:
+            signals (list of np.ndarray): The raw audio signals.
+
+        Returns:
+            list of np.ndarray: The MFCC features of each signal, in the input order.
+        """
+        if not signals:
+            return []
+
+        # Step 1-3: Frame every signal into its own rows of a shared buffer
+        frame_counts = [self._num_frames(len(signal)) for signal in signals]
+        frames = aligned_empty((sum(frame_counts), self._frame_length), dtype=np.float32)
+        start = 0
+        for signal, count in zip(signals, frame_counts):
+            self._emphasize_and_frame(signal, out=frames[start:start + count])
+            start += count
+
+        # Step 4-8: Compute the MFCCs of all frames and split them per signal
+        mfcc_features = self._compute_mfcc(frames)
+        return np.split(mfcc_features, np.cumsum(frame_counts)[:-1])
+
+    def _compute_mfcc(self, frames):
+        """
+        Compute the MFCCs of windowed frames (FFT, power spectrum, Mel, log and DCT).
+
+        Args:
+            frames (np.ndarray): The windowed frames; the buffer is overwritten.
+
+        Returns:
+            np.ndarray: The MFCC features (shape: [num_frames, num_ceps]).
+        """
+        # Step 4-8 on the GPU for long inputs, if available
+        if self.use_cuda and frames.shape[0] >= self._cuda_min_frames:
+            cuda_stages = self._load_cuda_stages()
+            if cuda_stages is not None:
+                return cuda_stages.compute_mfcc(frames)
+
+        # Step 4: Compute FFT, the frames buffer is no longer needed afterwards
+        fft_result = self.fft_processor.compute_fft(frames, overwrite_x=True)
+
+        # Step 5-6: Compute the power spectrum (|FFT|^2) and apply the Mel filterbank
+        # into reusable buffers
+        num_frames = fft_result.shape[0]
+        self._ensure_spectrum_capacity(num_frames)
+        mel_spectrum = self.fft_processor.compute_mel_from_fft(
+            fft_result, self._mel_projection,
+            out_power=self._power_buf,
+            out_mel=self._mel_spectrum_buf[:num_frames],
+        )
+
+        # Step 7: Apply logarithm compression in place
         log_mel_spectrum = self.log_compressor.apply(mel_spectrum)
-        
-        # Step 8: Compute MFCCs using DCT
-        mfcc_features = self.dct_processor.compute_dct(log_mel_spectrum)
-        #test
-        print(type(mfcc_features))
-        if isinstance(mfcc_features, np.ndarray):
-            print("mfcc_features is a numpy array.")
-        else:
-            print("mfcc_features is not a numpy array.")
-        
+
+        # Step 8: Compute MFCCs by projecting onto the precomputed DCT basis
+        mfcc_features = np.dot(log_mel_spectrum, self._dct.T)
+
         return mfcc_features
 
+    def reset_stream(self):
+        """
+        Reset the streaming state so that the next chunk starts a new stream.
+
+        The preallocated streaming buffers are kept and reused.
+        """
+        self._tail_length = 0
+        self._last_sample = None
+
+    def extract_features_stream(self, chunk, copy=True, min_frames=1):
+        """
+        Extract MFCC features from the next chunk of an audio stream.
+
+        Samples that do not yet fill a complete frame are carried over to the next call,
+        and pre-emphasis continues across chunk boundaries, so feeding a signal chunk by
+        chunk yields the same frames as extract_features on the whole signal (except for
+        the zero-padded final frame). The intermediate buffers are allocated once and
+        reused for every chunk, growing only when a larger chunk arrives.
+
+        Args:
+            chunk (np.ndarray): The next samples of the raw audio signal, either 1-D or a
+                                [num_samples, num_channels] block as returned by a blocking
+                                audio input read; blocks are downmixed to mono as in load_wav,
+                                and a float32 mono block is used without copying. Integer PCM
+                                arrays (e.g. int16 from an audio device) are scaled to [-1, 1)
+                                as soundfile does when decoding to float.
+            copy (bool): Return a copy of the features. With copy=False the result is a view
+                         into a buffer owned by the extractor, so a real-time caller allocates
+                         nothing per chunk; the view is only valid until the next call.
+            min_frames (int): Only compute features once at least this many frames are
+                              complete, buffering the samples otherwise. Batching short
+                              chunks this way runs the FFT and BLAS stages once over many
+                              frames instead of once per chunk; pass an empty chunk with
+                              min_frames=1 to flush the frames still buffered.
+
+        Returns:
+            np.ndarray: The MFCC features of the frames completed since the last call that
+                        returned features (shape: [num_frames, num_ceps], possibly zero frames).
+        """
+        if isinstance(chunk, np.ndarray) and chunk.dtype.kind == 'i':
+            # Convert and scale in a single pass rather than converting first
+            chunk = np.multiply(chunk, np.float32(-1.0 / np.iinfo(chunk.dtype).min), dtype=np.float32)
+        else:
+            chunk = np.asarray(chunk, dtype=np.float32)
+        if chunk.ndim > 1 and chunk.shape[1] > 1:
+            chunk = chunk.mean(axis=1, dtype=np.float32)
+        chunk = chunk.reshape(-1)
+
+        # Append the pre-emphasized chunk after the samples left over from the previous call
+        start = self._tail_length
+        end = start + chunk.size
+        if chunk.size > 0:
+            self._ensure_stream_capacity(end)
+            emphasized = self._tail[start:end]
+            np.multiply(chunk[:-1], self.pre_emphasis_filter.alpha, out=emphasized[1:])
+            np.subtract(chunk[1:], emphasized[1:], out=emphasized[1:])
+            if self._last_sample is None:
+                emphasized[0] = chunk[0]
+            else:
+                emphasized[0] = chunk[0] - self.pre_emphasis_filter.alpha * self._last_sample
+            self._last_sample = chunk[-1]
+
+        num_frames = 0
+        if end >= self._frame_length:
+            num_frames = (end - self._frame_length) // self._frame_step + 1
+        if num_frames == 0 or num_frames < min_frames:
+            self._tail_length = end
+            return self._stream_result(0, copy)
+
+        # Frame and window the buffered signal directly into the frame buffer
+        windows = np.lib.stride_tricks.sliding_window_view(self._tail[:end], self._frame_length)
+        frames = self._frame_buf[:num_frames]
+        copy_frames(windows[::self._frame_step][:num_frames], self._window, frames, self.remove_dc)
+
+        fft_result = self.fft_processor.compute_fft(frames, overwrite_x=True)
+        mel_spectrum = self.fft_processor.compute_mel_from_fft(
+            fft_result, self._mel_projection,
+            out_power=self._power_buf,
+            out_mel=self._mel_buf[:num_frames],
+        )
+        self.log_compressor.apply(mel_spectrum)
+
+        mfcc_features = self._mfcc_buf[:num_frames]
+        np.dot(mel_spectrum, self._dct.T, out=mfcc_features)
+
+        # Keep the samples that overlap the next frame
+        consumed = num_frames * self._frame_step
+        self._tail_length = end - consumed
+        self._tail[:self._tail_length] = self._tail[consumed:end]
+
+        return self._stream_result(num_frames, copy)
+
+    def _stream_result(self, num_frames, copy):
+        """
+        Return the first num_frames rows of the streaming MFCC buffer.
+
+        Args:
+            num_frames (int): The number of frames computed by the current call.
+            copy (bool): Return a copy instead of a view into the buffer.
+
+        Returns:
+            np.ndarray: The MFCC features (shape: [num_frames, num_ceps]).
+        """
+        mfcc_features = self._mfcc_buf[:num_frames]
+        return mfcc_features.copy() if copy else mfcc_features
+
+    def _ensure_stream_capacity(self, num_samples):
+        """
+        Grow the streaming buffers so they can hold num_samples buffered samples.
+
+        Args:
+            num_samples (int): The number of samples that must fit in the buffer.
+        """
+        if num_samples <= self._tail.size:
+            return
+        capacity = max(num_samples, 2 * self._tail.size)
+        tail = np.empty(capacity, dtype=np.float32)
+        tail[:self._tail_length] = self._tail[:self._tail_length]
+        self._tail = tail
+
+        max_frames = max(0, (capacity - self._frame_length) // self._frame_step + 1)
+        self._frame_buf = aligned_empty((max_frames, self._frame_length), dtype=np.float32)
+        self._mel_buf = np.empty((max_frames, self._mel.shape[0]), dtype=np.float32)
+        self._mfcc_buf = np.empty((max_frames, self._dct.shape[0]), dtype=np.float32)
+
+    def _load_cuda_stages(self):
+        """
+        Load the CUDA spectral stages once, importing PyTorch on first use.
+
+        Returns:
+            CudaSpectralStages or None: The CUDA stages, or None when CUDA cannot be used.
+        """
+        if not self._cuda_loaded:
+            self._cuda_stages = load_cuda_stages(self.fft_size, self._mel, self._dct, self.log_compressor.epsilon)
+            self._cuda_loaded = True
+        return self._cuda_stages
+
+    def _ensure_spectrum_capacity(self, num_frames):
+        """
+        Grow the Mel spectrum buffer used by extract_features.
+
+        Args:
+            num_frames (int): The number of frames that must fit in the buffer.
+        """
+        if num_frames <= self._mel_spectrum_buf.shape[0]:
+            return
+        self._mel_spectrum_buf = np.empty((num_frames, self._mel.shape[0]), dtype=np.float32)
+
+    def _num_frames(self, signal_length):
+        """
+        Compute the number of frames needed to cover a signal of the given length.
+
+        Args:
+            signal_length (int): The number of samples in the signal.
+
+        Returns:
+            int: The number of frames.
+        """
+        return max(0, int(np.ceil(float(signal_length - self._frame_length) / self._frame_step)) + 1)
+
+    def _emphasize_and_frame(self, signal, out=None):
+        """
+        Apply the pre-emphasis filter, frame the signal and apply the Hamming window.
+
+        Uses the fused Numba kernel when Numba is available, otherwise the NumPy stages.
+
+        Args:
+            signal (np.ndarray): The raw audio signal.
+            out (np.ndarray): Optional C-contiguous float32 buffer for the frames.
+
+        Returns:
+            np.ndarray: The windowed frames (shape: [num_frames, frame_length]).
+        """
+        if emphasize_frame_window is None:
+            return self._build_frames(self.pre_emphasis_filter.apply_filter(signal), out=out)
+
+        signal = np.ascontiguousarray(signal, dtype=np.float32)
+        num_frames = self._num_frames(len(signal))
+        if out is None:
+            out = aligned_empty((num_frames, self._frame_length), dtype=np.float32)
+        return emphasize_frame_window(signal, self._window, self._frame_step, num_frames,
+                                      self.pre_emphasis_filter.alpha, out, self.remove_dc)
+
+    def _build_frames(self, signal, out=None):
+        """
+        Frame the signal and apply the Hamming window in a single pass.
+
+        Args:
+            signal (np.ndarray): The pre-emphasized audio signal.
+            out (np.ndarray): Optional buffer for the frames.
+
+        Returns:
+            np.ndarray: The windowed frames (shape: [num_frames, frame_length]).
+        """
+        return self.framing.frame_signal(signal, window=self._window, out=out, remove_dc=self.remove_dc)
+
     def load_wav(self, filepath):
         """
         Load a .wav file and return its signal.
 
+        The file is decoded directly to float32 and downmixed to mono. It is only
+        resampled when its sampling rate differs from the extractor's sample rate.
+
         Args:
             filepath (str): The path to the .wav file.
 
         Returns:
-            np.ndarray: The loaded audio signal.
+            np.ndarray: The loaded audio signal (float32).
         """
-        signal, _ = librosa.load(filepath, sr=self.sample_rate)
+        with _open_for_single_pass(filepath) as fd:
+            signal, sample_rate = sf.read(fd, dtype='float32', always_2d=False, closefd=False)
+        if signal.ndim > 1:
+            signal = signal.mean(axis=1, dtype=np.float32)
+
+        if sample_rate != self.sample_rate:
+            from scipy.signal import resample_poly
+
+            factor = gcd(sample_rate, self.sample_rate)
+            signal = resample_poly(signal, self.sample_rate // factor, sample_rate // factor)
+            signal = signal.astype(np.float32, copy=False)
         return signal
-def visualize_mfcc(mfcc_features, sample_rate, hop_length):
-    """
-    Visualize MFCC features using a heatmap.
 
-    Args:
-        mfcc_features (np.ndarray): The extracted MFCC features (2D array: frames x coefficients).
-        sample_rate (int): The sample rate of the audio signal.
-        hop_length (int): The number of samples between successive frames (used to calculate time axis).
-    """
-    # Create time axis in seconds
-    num_frames = mfcc_features.shape[0]
-    time_axis = np.arange(num_frames) * hop_length / sample_rate
-    
-    # Plot heatmap of MFCCs
-    plt.figure(figsize=(10, 6))
-    plt.imshow(mfcc_features.T, aspect='auto', origin='lower', cmap='jet', extent=[time_axis.min(), time_axis.max(), 0, mfcc_features.shape[1]])
-    plt.colorbar(format='%+2.0f dB')
-    plt.title('MFCC Features')
-    plt.xlabel('Time (s)')
-    plt.ylabel('MFCC Coefficients')
-    plt.tight_layout()
-    plt.show()
-    # Save the image as a file
-    plt.savefig("custome_mfcc.png")
-    plt.close()  # Close the figure after saving
-    
-def plot_mfcc_coefficients_over_time(mfcc_features, sample_rate, hop_length):
-    # Only keep the first 13 coefficients
-    mfcc_features = mfcc_features[:13, :]  # Keep the first 13 coefficients
+    def iter_wav_features(self, filepath, block_seconds=1.0):
+        """
+        Extract MFCC features from a .wav file block by block, without loading the whole file.
 
-    # Time axis for the x-axis
-    time_axis = np.arange(mfcc_features.shape[1]) * hop_length / sample_rate
+        The file is decoded in blocks of block_seconds with soundfile.blocks (libsndfile
+        reads into one reused buffer) and each block is passed to extract_features_stream,
+        so memory stays bounded by the block size however long the recording is. The
+        features are those of extract_features_stream: the same frames as extract_features
+        on the whole file, without the zero-padded final frame. Files whose sampling rate
+        differs from the extractor's are loaded and resampled whole (see load_wav).
+
+        Uses the streaming state of this extractor, which is reset before and after.
+
+        Args:
+            filepath (str): The path to the .wav file.
+            block_seconds (float): The duration of each block read from the file.
+
+        Yields:
+            np.ndarray: The MFCC features of the frames completed by each block
+                        (shape: [num_frames, num_ceps]).
+        """
+        if sf.info(filepath).samplerate != self.sample_rate:
+            yield self.extract_features(self.load_wav(filepath))
+            return
+
+        blocksize = max(1, int(block_seconds * self.sample_rate))
+        self.reset_stream()
+        try:
+            with _open_for_single_pass(filepath) as fd:
+                for block in sf.blocks(fd, blocksize=blocksize, dtype='float32', always_2d=True, closefd=False):
+                    mfcc_features = self.extract_features_stream(block)
+                    if len(mfcc_features):
+                        yield mfcc_features
+        finally:
+            self.reset_stream()
+
+@functools.lru_cache(maxsize=8)
+def _extractor_cached(cls, sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps):
+    """
+    Build the extractor returned by AudioFeatureExtractor.get, once per parameter set.
+    """
+    return cls(sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps)
 
-    plt.figure(figsize=(10, 6))
-    
-    # Plot each coefficient over time
-    for i in range(mfcc_features.shape[0]):
-        plt.plot(time_axis, mfcc_features[i, :], label=f'Coefficient {i+1}')
-    
-    plt.title('MFCC Coefficients Over Time (First 13 Coefficients)')
-    plt.xlabel('Time (s)')
-    plt.ylabel('Coefficient Value')
-    plt.legend(loc='upper right')  # Adjust legend position if needed
-    plt.grid(True)
-    plt.savefig('mfcc_over_time_13coeff.png')  # Save the plot as an image
-    plt.show()
-    
 # Example usage
 if __name__ == "__main__":
+    import librosa
+    import librosa.display
+    import matplotlib.pyplot as plt
+    from feature_extraction.viz import visualize_mfcc, plot_mfcc_coefficients_over_time
+
     extractor = AudioFeatureExtractor()
 
     # Load a test wav file (replace 'path_to_wav' with your actual file path)
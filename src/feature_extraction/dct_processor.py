@@ -1,15 +1,48 @@
+import logging
 import numpy as np
-from scipy.fftpack import dct
+
+logger = logging.getLogger(__name__)
 
 class DCTProcessor:
-    def __init__(self, num_ceps):
+    def __init__(self, num_ceps, num_filters=None):
         """
         Initialize the DCT processor for computing MFCCs.
 
+        The orthonormal DCT-II basis is precomputed, so computing the MFCCs is a single
+        matrix product instead of a full DCT per frame:
+        basis[k, m] = sqrt(2/M) * cos(pi * k * (m + 0.5) / M), with sqrt(1/M) for k = 0
+
         Args:
             num_ceps (int): The number of MFCC coefficients to retain.
+            num_filters (int): The number of Mel filters (length of each log Mel frame), to build
+                               the basis up front. When omitted, or when a spectrum of another
+                               width is passed, the basis is built for the width of the input
+                               on first use and cached.
         """
         self.num_ceps = num_ceps
+        self.num_filters = num_filters
+        # DCT basis per input width
+        self._bases = {}
+        self.basis = self.get_basis(num_filters) if num_filters is not None else None
+
+    def get_basis(self, num_filters):
+        """
+        Return the first num_ceps rows of the orthonormal DCT-II matrix for num_filters inputs.
+
+        Args:
+            num_filters (int): The length of each log Mel frame.
+
+        Returns:
+            np.ndarray: The DCT basis (shape: [min(num_ceps, num_filters), num_filters]).
+        """
+        basis = self._bases.get(num_filters)
+        if basis is None:
+            k = np.arange(min(self.num_ceps, num_filters))[:, np.newaxis]
+            m = np.arange(num_filters)[np.newaxis, :]
+            basis = np.sqrt(2.0 / num_filters) * np.cos(np.pi * k * (m + 0.5) / num_filters)
+            basis[0] = np.sqrt(1.0 / num_filters)
+            basis = self._bases[num_filters] = np.ascontiguousarray(basis, dtype=np.float32)
+        return basis
 
     def compute_dct(self, log_mel_spectrum):
         """
@@ -21,9 +54,10 @@ class DCTProcessor:
         Returns:
             np.ndarray: The MFCCs for the input Mel-filtered spectrum.
         """
-        # Apply the DCT to each frame's log Mel-filtered spectrum and keep the first num_ceps coefficients
-        mfcc = dct(log_mel_spectrum, type=2, axis=1, norm='ortho')[:, :self.num_ceps]
-        print(f"The shape of MFCC is {mfcc.shape}")
+        # Project each frame's log Mel-filtered spectrum onto the first num_ceps DCT basis vectors
+        mfcc = log_mel_spectrum @ self.get_basis(log_mel_spectrum.shape[-1]).T
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("The shape of MFCC is %s", mfcc.shape)
         return mfcc
 
 class LogarithmCompression:
@@ -39,14 +73,19 @@ class LogarithmCompression:
     def apply(self, mel_spectrum):
         """
         Apply logarithmic compression to the Mel-filtered spectrum.
+
+        The compression is done in place: the input array is overwritten with the
+        log-compressed values and returned, so no temporary arrays are allocated.
         
         Args:
-            mel_spectrum (np.ndarray): The Mel-filtered spectrum.
+            mel_spectrum (np.ndarray): The Mel-filtered spectrum (floating point, modified in place).
         
         Returns:
             np.ndarray: The log-compressed Mel spectrum.
         """
-        return np.log(mel_spectrum + self.epsilon)
+        np.add(mel_spectrum, self.epsilon, out=mel_spectrum)
+        np.log(mel_spectrum, out=mel_spectrum)
+        return mel_spectrum
 
 # Example Testing
 if __name__ == "__main__":
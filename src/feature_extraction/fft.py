@@ -1,4 +1,11 @@
 import numpy as np
+import scipy.fft as sfft
+import scipy.sparse as sparse
+
+# Number of frames per block in compute_mel_from_fft. A block of the power spectrum
+# (256 x 257 float32 = 257 KB for n_fft=512) stays in L2 cache between |X|^2 and the
+# Mel product instead of making a round trip through memory.
+MEL_BLOCK_FRAMES = 256
 
 class FFTProcessor:
     def __init__(self, n_fft):
@@ -15,34 +22,90 @@ class FFTProcessor:
                          the computational cost of the FFT.
         """
         self.n_fft = n_fft
+        self._rfft = sfft.rfft
 
-    def compute_fft(self, frames):
+    def compute_fft(self, frames, overwrite_x=False):
         """
         Compute the FFT for each frame.
 
+        The frames are converted to a C-contiguous float32 array so that the single-precision
+        kernel is used, and the transform is parallelized across frames on all available cores.
+
         Args:
             frames (np.ndarray): 2D array where each row is a frame.
+            overwrite_x (bool): Allow the FFT to reuse the frames buffer as scratch space.
         
         Returns:
             np.ndarray: The FFT result of the frames.
         """
+        frames = np.ascontiguousarray(frames, dtype=np.float32)
+
         # Apply FFT to each frame
-        fft_result = np.fft.rfft(frames, n=self.n_fft)
+        fft_result = self._rfft(frames, n=self.n_fft, axis=-1, workers=-1, overwrite_x=overwrite_x)
         return fft_result
 
-    def compute_power_spectrum(self, fft_result):
+    def compute_power_spectrum(self, fft_result, out=None):
         """
         Compute the power spectrum from the FFT result.
 
+        The magnitude is written into a single real buffer and squared in place, so
+        no temporary arrays are allocated. Passing a preallocated out buffer avoids
+        allocating the result as well.
+
         Args:
             fft_result (np.ndarray): FFT output for each frame (complex numbers).
+            out (np.ndarray): Optional buffer for the result, with the shape of fft_result
+                              and the matching real dtype (float32 for complex64 input).
         
         Returns:
             np.ndarray: Power spectrum (|FFT|^2) of the frames.
         """
         # Compute the power spectrum (|FFT|^2)
-        power_spectrum = np.abs(fft_result) ** 2
+        power_spectrum = np.abs(fft_result, out=out)
+        np.square(power_spectrum, out=power_spectrum)
         return power_spectrum
+
+    def compute_mel_from_fft(self, fft_result, mel_matrix, out_power=None, out_mel=None,
+                             block_frames=MEL_BLOCK_FRAMES):
+        """
+        Compute the Mel spectrum directly from the FFT result.
+
+        The frames are processed in blocks of block_frames: the power spectrum of a block
+        is written into a block-sized scratch buffer and immediately projected onto the
+        Mel filterbank into the block's rows of out_mel. The full power spectrum is never
+        materialized, and each block is still in cache when it is projected. With both
+        buffers preallocated, nothing is allocated between the FFT and Mel stages.
+
+        Args:
+            fft_result (np.ndarray): FFT output for each frame (complex numbers).
+            mel_matrix (np.ndarray or scipy.sparse matrix): The Mel filterbank
+                (shape: [num_filters, n_fft // 2 + 1]), dense or sparse.
+            out_power (np.ndarray): Optional C-contiguous scratch buffer for the power spectrum
+                of one block (shape: [>= block_frames, n_fft // 2 + 1]).
+            out_mel (np.ndarray): Optional buffer for the Mel spectrum (shape: [num_frames, num_filters]).
+            block_frames (int): The number of frames per block.
+
+        Returns:
+            np.ndarray: The Mel spectrum of the frames (shape: [num_frames, num_filters]).
+        """
+        num_frames, num_bins = fft_result.shape
+        dtype = fft_result.real.dtype
+        if out_mel is None:
+            out_mel = np.empty((num_frames, mel_matrix.shape[0]), dtype=dtype)
+
+        block_frames = max(1, min(block_frames, num_frames))
+        if out_power is None or out_power.shape[0] < block_frames:
+            out_power = np.empty((block_frames, num_bins), dtype=dtype)
+        is_sparse = sparse.issparse(mel_matrix)
+
+        for start in range(0, num_frames, block_frames):
+            stop = min(start + block_frames, num_frames)
+            power_spectrum = self.compute_power_spectrum(fft_result[start:stop], out=out_power[:stop - start])
+            if is_sparse:
+                np.copyto(out_mel[start:stop], (mel_matrix @ power_spectrum.T).T)
+            else:
+                np.dot(power_spectrum, mel_matrix.T, out=out_mel[start:stop])
+        return out_mel
     
 if __name__ == "__main__":
     # Example usage
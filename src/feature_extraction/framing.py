@@ -12,8 +12,78 @@
 
 import numpy as np
 
+from feature_extraction._mfcc_numba import frame_window
+
+# Alignment (in bytes) of frame buffers, enough for AVX-512 loads in the FFT and BLAS kernels
+FRAME_ALIGNMENT = 64
+
+def aligned_empty(shape, dtype=np.float32, alignment=FRAME_ALIGNMENT):
+    """
+    Allocate an uninitialized C-contiguous array whose data starts on an aligned address.
+
+    Args:
+        shape (tuple): The shape of the array.
+        dtype (np.dtype): The data type of the array.
+        alignment (int): The required alignment of the first element, in bytes.
+
+    Returns:
+        np.ndarray: The aligned array.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    if nbytes == 0:
+        # An empty array has no element to align, and slicing an empty buffer may leave its
+        # data pointer anywhere
+        return np.empty(shape, dtype=dtype)
+    buffer = np.empty(nbytes + alignment, dtype=np.uint8)
+    offset = -buffer.ctypes.data % alignment
+    return buffer[offset:offset + nbytes].view(dtype).reshape(shape)
+
+def copy_frames(windows, window, frames, remove_dc=False):
+    """
+    Copy frames from a sliding window view into an output buffer, windowing them if requested.
+
+    Args:
+        windows (np.ndarray): The frames, as a strided view over the signal.
+        window (np.ndarray): Optional window applied to every frame.
+        frames (np.ndarray): The output buffer (shape: [num_frames, frame_length]).
+        remove_dc (bool): Subtract each frame's mean while copying it, before the window is applied.
+    """
+    if remove_dc:
+        # Subtract the mean as part of the copy, then window the copy in place
+        np.subtract(windows, windows.mean(axis=1, dtype=np.float32, keepdims=True), out=frames)
+        if window is not None:
+            np.multiply(frames, window, out=frames)
+    elif window is None:
+        np.copyto(frames, windows)
+    else:
+        np.multiply(windows, window, out=frames)
+
+# Policies for rounding the frame length (in samples) up to an FFT-friendly size
+FRAME_SIZE_POLICIES = ("exact", "pow2", "5smooth")
+
+def next_5_smooth(n):
+    """
+    Return the smallest integer >= n whose only prime factors are 2, 3 and 5.
+
+    Args:
+        n (int): The lower bound.
+
+    Returns:
+        int: The 5-smooth number.
+    """
+    n = max(n, 1)
+    while True:
+        remainder = n
+        for prime in (2, 3, 5):
+            while remainder % prime == 0:
+                remainder //= prime
+        if remainder == 1:
+            return n
+        n += 1
+
 class Framing:
-    def __init__(self, frame_size, frame_step, sample_rate):
+    def __init__(self, frame_size, frame_step, sample_rate, frame_size_policy="exact"):
         """
         Initialize the Framing class.
 
@@ -21,48 +91,133 @@ class Framing:
             frame_size (float): Frame size in seconds.
             frame_step (float): Frame step (overlap) in seconds.
             sample_rate (int): The sampling rate of the audio signal.
+            frame_size_policy (str): How the frame length in samples is derived from frame_size:
+                "exact" uses int(frame_size * sample_rate); "pow2" and "5smooth" round it up to
+                the next power of two or 5-smooth number, so that an FFT over the frame has a
+                fast size. Rounding up slightly widens each frame (the step is unchanged).
         """
+        if frame_size_policy not in FRAME_SIZE_POLICIES:
+            raise ValueError(f"Unknown frame_size_policy {frame_size_policy!r}, expected one of {FRAME_SIZE_POLICIES}.")
         self.frame_size = frame_size
         self.frame_step = frame_step
         self.sample_rate = sample_rate
+        self.frame_size_policy = frame_size_policy
+
+        # Frame length and step in samples
+        self.frame_length = self._compute_frame_length()
+        self.frame_step_length = int(self.frame_step * self.sample_rate)
+
+        # Zero-padded copy of the end of the signal, reused across calls
+        self._scratch = np.empty(0, dtype=np.float32)
+
+    def _compute_frame_length(self):
+        """
+        Convert the frame size to samples according to the frame size policy.
 
-    def frame_signal(self, signal):
+        Returns:
+            int: The frame length in samples.
+        """
+        frame_length = int(self.frame_size * self.sample_rate)
+        if self.frame_size_policy == "pow2":
+            return 1 << (frame_length - 1).bit_length()
+        if self.frame_size_policy == "5smooth":
+            return next_5_smooth(frame_length)
+        return frame_length
+
+    def frame_signal(self, signal, window=None, out=None, remove_dc=False):
         """
         Frame the given signal into overlapping frames.
 
         Args:
             signal (list): The input audio signal.
+            window (np.ndarray): Optional window (e.g. HammingWindow.hamming_window) applied to
+                                 every frame while it is written, instead of in a separate pass.
+            out (np.ndarray): Optional C-contiguous float32 buffer of shape [num_frames,
+                              frame_length] to write the frames into, so that a caller framing
+                              many signals can reuse one buffer. It need not be aligned (e.g. a
+                              slice of rows of a larger buffer), though aligned buffers (see
+                              aligned_empty) let the downstream kernels run fastest.
+            remove_dc (bool): Subtract each frame's mean (DC offset) before the window is applied.
+
+        Unless written into out, the frames are returned as a C-contiguous float32 array aligned
+        to FRAME_ALIGNMENT bytes, the layout the downstream FFTProcessor and MelScaleFilterbank
+        kernels run fastest on. A signal of at most frame_length - frame_step samples yields
+        no frames.
 
         Returns:
-            2D list: A list of frames, where each frame is a sub-list of signal samples.
+            np.ndarray: 2D array of frames (shape: [num_frames, frame_length]).
         """
-        # Convert frame size and step from seconds to samples
-        frame_length = int(self.frame_size * self.sample_rate)
-        frame_step = int(self.frame_step * self.sample_rate)
+        frame_length = self.frame_length
+        frame_step = self.frame_step_length
 
         # Calculate the total number of frames
         signal_length = len(signal)
-        num_frames = int(np.ceil(float(signal_length - frame_length) / frame_step)) + 1
-
-        # Pad the signal if necessary to ensure we get all frames
-        pad_signal_length = num_frames * frame_step + frame_length
-        padding = np.zeros((pad_signal_length - signal_length,))
-        padded_signal = np.concatenate((signal, padding))
-
-        # Generate the frames
-        frames = []
-        for i in range(0, num_frames):
-            # Calculate the start index of the current frame
-            start_index = i * frame_step
-
-            # Extract the current frame from the padded signal
-            frame = padded_signal[start_index:start_index + frame_length]
-
-            # Append the current frame to the frames list
-            frames.append(frame)
-        
-        # Convert the frames list to a numpy array
-        return np.array(frames)
+        num_frames = max(0, int(np.ceil(float(signal_length - frame_length) / frame_step)) + 1)
+
+        if out is None:
+            frames = aligned_empty((num_frames, frame_length), dtype=np.float32)
+        else:
+            frames = out
+
+        if window is not None and frame_window is not None:
+            # Frame and window the signal in one pass with the Numba kernel
+            signal = np.ascontiguousarray(signal, dtype=np.float32)
+            frame_window(signal, np.asarray(window, dtype=np.float32), frame_step, num_frames, frames, remove_dc)
+        else:
+            # Frames that lie entirely inside the signal are taken as a zero-copy sliding window
+            # view over it. Only the last few frames run past the end of the signal, so only the
+            # samples they cover are copied into the zero-padded scratch buffer, instead of
+            # padding (and copying) the whole signal.
+            signal = np.asarray(signal, dtype=np.float32)
+            num_full = 0
+            if signal_length >= frame_length:
+                num_full = min(num_frames, (signal_length - frame_length) // frame_step + 1)
+            if num_full > 0:
+                windows = np.lib.stride_tricks.sliding_window_view(signal, frame_length)[::frame_step]
+                copy_frames(windows[:num_full], window, frames[:num_full], remove_dc)
+
+            if num_full < num_frames:
+                tail_start = num_full * frame_step
+                tail_length = signal_length - tail_start
+                pad_length = (num_frames - num_full - 1) * frame_step + frame_length
+                if self._scratch.size < pad_length:
+                    self._scratch = np.empty(pad_length, dtype=np.float32)
+                padded_tail = self._scratch[:pad_length]
+                padded_tail[:tail_length] = signal[tail_start:]
+                padded_tail[tail_length:] = 0
+                windows = np.lib.stride_tricks.sliding_window_view(padded_tail, frame_length)[::frame_step]
+                copy_frames(windows[:num_frames - num_full], window, frames[num_full:], remove_dc)
+
+        return frames
+
+    def iter_frames(self, signal, batch_size=256, window=None, remove_dc=False):
+        """
+        Frame the given signal in batches of frames, to bound memory on long audio.
+
+        Yields the same frames as frame_signal, batch_size frames at a time. Each batch is
+        framed directly from its own span of the signal, so only one batch of frames is
+        held in memory at a time.
+
+        Args:
+            signal (np.ndarray): The input audio signal.
+            batch_size (int): The maximum number of frames per batch.
+            window (np.ndarray): Optional window applied to every frame (see frame_signal).
+            remove_dc (bool): Subtract each frame's mean before windowing it (see frame_signal).
+
+        Yields:
+            np.ndarray: Aligned, C-contiguous float32 arrays of frames
+                        (shape: [<= batch_size, frame_length]).
+        """
+        frame_length = self.frame_length
+        frame_step = self.frame_step_length
+        num_frames = max(0, int(np.ceil(float(len(signal) - frame_length) / frame_step)) + 1)
+
+        for first_frame in range(0, num_frames, batch_size):
+            count = min(batch_size, num_frames - first_frame)
+            start = first_frame * frame_step
+            # The span covering this batch's frames; frame_signal pads the final one
+            end = start + (count - 1) * frame_step + frame_length
+            yield self.frame_signal(signal[start:end], window=window, remove_dc=remove_dc)
 
 if __name__ == "__main__":
     # Example usage:
@@ -17,8 +17,6 @@
 
 import numpy as np
 
-import numpy as np
-
 class HammingWindow:
     def __init__(self, frame_length):
         """
@@ -50,11 +48,22 @@ class HammingWindow:
     def _compute_hamming_window(self):
         """
         Compute the Hamming window for a given frame length.
+
+        The window is evaluated in double precision and stored as float32, the precision
+        of the frames and of the FFT it feeds.
         
         Returns:
-            np.ndarray: The Hamming window of the same length as the frame.
+            np.ndarray: The Hamming window of the same length as the frame (float32).
         """
-        return 0.54 - 0.46 * np.cos(2 * np.pi * np.arange(self.frame_length) / (self.frame_length - 1))
+        if self.frame_length == 1:
+            return np.ones(1, dtype=np.float32)
+        # Evaluate 0.54 - 0.46 * cos(2*pi*n / (N-1)) in a single buffer
+        window = np.arange(self.frame_length, dtype=np.float64)
+        window *= 2 * np.pi / (self.frame_length - 1)
+        np.cos(window, out=window)
+        window *= -0.46
+        window += 0.54
+        return window.astype(np.float32)
 
     def apply(self, frames):
         """
@@ -64,6 +73,22 @@ class HammingWindow:
             frames (np.ndarray): 2D array where each row is a frame.
             
         Returns:
-            np.ndarray: The windowed frames.
+            np.ndarray: The windowed frames, as a new array.
         """
         return frames * self.hamming_window
+
+    def apply_inplace(self, frames):
+        """
+        Apply the Hamming window to each frame, overwriting the frames.
+
+        Avoids allocating a second [num_frames, frame_length] array when the unwindowed
+        frames are not needed afterwards.
+
+        Args:
+            frames (np.ndarray): 2D floating point array where each row is a frame (modified in place).
+
+        Returns:
+            np.ndarray: The windowed frames (the same array as the input).
+        """
+        np.multiply(frames, self.hamming_window, out=frames)
+        return frames
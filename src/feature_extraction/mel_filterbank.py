@@ -1,11 +1,28 @@
+import os
 import numpy as np
-import librosa
-import matplotlib.pyplot as plt
+
+# Directory where computed filterbanks are cached, keyed on their parameters: $MEL_CACHE_DIR if
+# set, otherwise the user's cache directory ($XDG_CACHE_HOME, by default ~/.cache)
+MEL_CACHE_DIRECTORY = os.environ.get('MEL_CACHE_DIR') or os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'voice-recognition-engine', 'mel_cache')
+
+# The filterbank is applied as a CSR sparse matrix when at most this fraction of it is non-zero.
+# Each triangular filter only spans a few bins, but for small filterbanks (e.g. 26 filters over
+# 257 bins, ~7% non-zero) a dense SGEMM is still faster; around 3% and below the sparse product
+# wins (about 2x for 128 filters over 1025 bins).
+SPARSE_MAX_DENSITY = 1 / 30
 
 class MelScaleFilterbank:
-    def __init__(self, sample_rate, num_filters, fft_size, low_freq=0, high_freq=None):
+    def __init__(self, sample_rate, num_filters, fft_size, low_freq=0, high_freq=None, backend="numpy", device=None,
+                 cache_directory=MEL_CACHE_DIRECTORY):
         """
         Initialize the Mel-scale filterbank using Librosa.
+
+        The filterbank is a deterministic function of its parameters, so it is saved as a .npy
+        file in cache_directory the first time it is computed and loaded from there afterwards,
+        which avoids importing librosa at all on later runs. The cache is best-effort: when it
+        cannot be read or written, the filterbank is computed as if caching were disabled.
         
         Args:
             sample_rate (int): The sampling rate of the audio signal.
@@ -13,43 +30,129 @@ class MelScaleFilterbank:
             fft_size (int): The size of the FFT (number of frequency bins).
             low_freq (float): The lowest frequency for the filterbank (default 0 Hz).
             high_freq (float): The highest frequency for the filterbank (default is Nyquist frequency).
+            backend (str): "numpy" to apply the filterbank with NumPy, or "torch" to keep it as a
+                           torch tensor and apply it with torch.matmul (requires PyTorch).
+            device (str): The torch device for the "torch" backend (default: "cuda" if available,
+                          otherwise "cpu").
+            cache_directory (str): Directory of the filterbank cache, or None to disable caching.
         """
+        if backend not in ("numpy", "torch"):
+            raise ValueError(f"Unknown backend {backend!r}, expected 'numpy' or 'torch'.")
         self.sample_rate = sample_rate
         self.num_filters = num_filters
         self.fft_size = fft_size
         self.low_freq = low_freq
         self.high_freq = high_freq or sample_rate / 2
         
+        self.filterbank = self._load_or_compute(cache_directory)
+        # Keep the (num_filters, fft_size // 2 + 1) matrix contiguous so apply() is a single SGEMM
+        self.filterbank = np.ascontiguousarray(self.filterbank)
+
+        # CSR copy of the filterbank, used by apply() when it is sparse enough to pay off
+        self.filterbank_sparse = None
+        if np.count_nonzero(self.filterbank) <= SPARSE_MAX_DENSITY * self.filterbank.size:
+            from scipy.sparse import csr_matrix
+            self.filterbank_sparse = csr_matrix(self.filterbank)
+
+        self.backend = backend
+        if backend == "torch":
+            # PyTorch is optional and heavy, so it is only imported for the torch backend
+            import torch
+            self._torch = torch
+            self.device = torch.device(device or ("cuda" if torch.cuda.is_available() else "cpu"))
+            self.filterbank_tensor = torch.from_numpy(self.filterbank).to(self.device)
+
+    def _load_or_compute(self, cache_directory):
+        """
+        Load the filterbank from the cache, computing and caching it on a miss.
+
+        Args:
+            cache_directory (str): Directory of the filterbank cache, or None to disable caching.
+
+        Returns:
+            np.ndarray: The filterbank (float32, shape: [num_filters, fft_size // 2 + 1]).
+        """
+        cache_path = None
+        if cache_directory is not None:
+            cache_name = (f"mel_{self.sample_rate}_{self.fft_size}_{self.num_filters}"
+                          f"_{float(self.low_freq)}_{float(self.high_freq)}.npy")
+            cache_path = os.path.join(cache_directory, cache_name)
+            try:
+                return np.load(cache_path)
+            except (OSError, ValueError):
+                # Missing, unreadable or truncated cache entry: compute the filterbank again
+                pass
+
+        # librosa is slow to import, so it is only imported when the filterbank is not cached
+        import librosa
+
         # Generate the Mel filterbank using Librosa
-        self.filterbank = librosa.filters.mel(
+        filterbank = librosa.filters.mel(
             sr=self.sample_rate,
             n_fft=self.fft_size,
             n_mels=self.num_filters,
             fmin=self.low_freq,
-            fmax=self.high_freq
+            fmax=self.high_freq,
+            dtype=np.float32
         )
-        
+
+        if cache_path is not None:
+            # Write to a temporary file and rename it, so a concurrent reader never sees a partial file
+            temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(cache_directory, exist_ok=True)
+                with open(temporary_path, 'wb') as f:
+                    np.save(f, filterbank)
+                os.replace(temporary_path, cache_path)
+            except OSError:
+                # A read-only or unusable cache directory only costs recomputing the filterbank
+                if os.path.exists(temporary_path):
+                    os.remove(temporary_path)
+
+        return filterbank
+
     def apply(self, power_spectrum):
         """
         Apply the Mel-scale filterbank to the power spectrum.
 
+        The product is computed in float32; other floating point input is converted first.
+
+        With the torch backend, a torch tensor input stays on the device and a tensor is
+        returned, so the following stages can keep working on the device; a NumPy input
+        is copied to the device and the result copied back to NumPy.
+
         Args:
-            power_spectrum (np.ndarray): The power spectrum of the frames (shape: [num_frames, fft_size // 2 + 1]).
+            power_spectrum (np.ndarray or torch.Tensor): The power spectrum of the frames
+                (shape: [num_frames, fft_size // 2 + 1]).
         
         Returns:
-            np.ndarray: The Mel-filtered spectrum.
+            np.ndarray or torch.Tensor: The Mel-filtered spectrum (shape: [num_frames, num_filters]).
         """
-        return np.dot(self.filterbank, power_spectrum.T).T
+        if self.backend == "torch":
+            torch = self._torch
+            if isinstance(power_spectrum, torch.Tensor):
+                return torch.matmul(power_spectrum.to(self.device), self.filterbank_tensor.T)
+            power_spectrum = torch.as_tensor(np.asarray(power_spectrum, dtype=np.float32), device=self.device)
+            return torch.matmul(power_spectrum, self.filterbank_tensor.T).cpu().numpy()
+
+        # Keep the product in single precision; a float64 input would otherwise upcast it to a DGEMM
+        power_spectrum = np.asarray(power_spectrum, dtype=np.float32)
+        if self.filterbank_sparse is not None:
+            # The sparse product is computed as (F @ P^T)^T, which yields a dense ndarray
+            return (self.filterbank_sparse @ power_spectrum.T).T
+        return power_spectrum @ self.filterbank.T
 
 # Test and visualize
 if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
     # Test signal parameters
     sample_rate = 16000  # 16 kHz
     fft_size = 512       # FFT size
     num_filters = 26     # Number of Mel filters
     
     # Create an example power spectrum (shape: [2 frames, fft_size // 2 + 1])
-    power_spectrum = np.random.random((2, fft_size // 2 + 1))  # Example random power spectrum for 2 frames
+    power_spectrum = np.random.random((2, fft_size // 2 + 1)).astype(np.float32)  # Example random power spectrum for 2 frames
     
     # Initialize Mel filterbank
     mel_filterbank = MelScaleFilterbank(
@@ -10,6 +10,8 @@
 #y[t] is the output signal.
 #x[t] is the input signal.
 #α is the pre-emphasis coefficient, usually between 0.95 and 0.99.
+import numpy as np
+
 class PreEmphasisFilter:
     """
     Class to apply a pre-emphasis filter to an input audio signal.
@@ -30,19 +32,30 @@ class PreEmphasisFilter:
     def apply_filter(self, signal):
         """
         Apply the pre-emphasis filter to the input signal.
+
+        The filter is a single vectorized subtraction over the whole signal. Floating point
+        input keeps its precision; any other input (lists of ints, PCM arrays) is converted
+        to float32, the precision used by the rest of the feature extraction pipeline.
         
         Args:
             signal (list or numpy array): The input audio signal.
         
         Returns:
-            list: The pre-emphasized signal.
+            numpy array: The pre-emphasized signal, as a new array.
         """
+        signal = np.asarray(signal)
+        if signal.dtype.kind != 'f':
+            signal = signal.astype(np.float32)
+        if signal.size == 0:
+            return signal.copy()
+
         # Initialize the output signal array with the same length as the input
-        emphasized_signal = [signal[0]]  # First element remains the same
-        
-        # Apply the filter to each sample in the signal
-        for i in range(1, len(signal)):
-            emphasized_signal.append(signal[i] - self.alpha * signal[i - 1])
+        emphasized_signal = np.empty_like(signal)
+        emphasized_signal[0] = signal[0]  # First element remains the same
+
+        # Apply the filter to the whole signal at once: y[1:] = x[1:] - alpha * x[:-1]
+        np.multiply(signal[:-1], self.alpha, out=emphasized_signal[1:])
+        np.subtract(signal[1:], emphasized_signal[1:], out=emphasized_signal[1:])
 
         return emphasized_signal
 
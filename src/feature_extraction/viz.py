@@ -0,0 +1,52 @@
+# Plotting helpers for inspecting MFCC features.
+# Kept separate from the feature extractor so that matplotlib is only imported when plotting.
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+def visualize_mfcc(mfcc_features, sample_rate, hop_length):
+    """
+    Visualize MFCC features using a heatmap.
+
+    Args:
+        mfcc_features (np.ndarray): The extracted MFCC features (2D array: frames x coefficients).
+        sample_rate (int): The sample rate of the audio signal.
+        hop_length (int): The number of samples between successive frames (used to calculate time axis).
+    """
+    # Create time axis in seconds
+    num_frames = mfcc_features.shape[0]
+    time_axis = np.arange(num_frames) * hop_length / sample_rate
+    
+    # Plot heatmap of MFCCs
+    plt.figure(figsize=(10, 6))
+    plt.imshow(mfcc_features.T, aspect='auto', origin='lower', cmap='jet', extent=[time_axis.min(), time_axis.max(), 0, mfcc_features.shape[1]])
+    plt.colorbar(format='%+2.0f dB')
+    plt.title('MFCC Features')
+    plt.xlabel('Time (s)')
+    plt.ylabel('MFCC Coefficients')
+    plt.tight_layout()
+    plt.show()
+    # Save the image as a file
+    plt.savefig("custome_mfcc.png")
+    plt.close()  # Close the figure after saving
+    
+def plot_mfcc_coefficients_over_time(mfcc_features, sample_rate, hop_length):
+    # Only keep the first 13 coefficients
+    mfcc_features = mfcc_features[:13, :]  # Keep the first 13 coefficients
+
+    # Time axis for the x-axis
+    time_axis = np.arange(mfcc_features.shape[1]) * hop_length / sample_rate
+
+    plt.figure(figsize=(10, 6))
+    
+    # Plot each coefficient over time
+    for i in range(mfcc_features.shape[0]):
+        plt.plot(time_axis, mfcc_features[i, :], label=f'Coefficient {i+1}')
+    
+    plt.title('MFCC Coefficients Over Time (First 13 Coefficients)')
+    plt.xlabel('Time (s)')
+    plt.ylabel('Coefficient Value')
+    plt.legend(loc='upper right')  # Adjust legend position if needed
+    plt.grid(True)
+    plt.savefig('mfcc_over_time_13coeff.png')  # Save the plot as an image
+    plt.show()
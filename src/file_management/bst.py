@@ -1,10 +1,20 @@
+import logging
 import pickle
 import os
 
+logger = logging.getLogger(__name__)
+
 class TreeNode:
     """
     A class to represent a node in the binary search tree
     """
+    # Fixed attribute slots instead of a per-node __dict__, which keeps nodes small
+    __slots__ = (
+        'file_id', 'file_timestamp', 'file_path', 'file_size', 'file_type', 'access_frequency',
+        'speaker_name', 'version', 'permissions', 'checksum', 'creation_date', 'description',
+        'left', 'right',
+    )
+
     def __init__(self, 
                  file_id: int, 
                  file_timestamp: int, 
@@ -48,8 +58,105 @@ class TreeNode:
         self.creation_date = creation_date
         self.description = description
         self.left = None
-        self.right = None 
-        
+        self.right = None
+
+    def __setstate__(self, state):
+        """
+        Restore a node from pickled state.
+
+        Nodes pickled before TreeNode had __slots__ carry their attributes in a plain
+        dict; attributes missing from old files default to None (access_frequency to 0).
+
+        Args:
+            state (dict or tuple): The pickled state, as a dict or a (dict, slots dict) pair.
+        """
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.access_frequency = 0
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            setattr(self, name, value)
+
+# Fields of a TreeNode, in the order they are stored in a serialized record (the order of
+# the TreeNode arguments)
+NODE_FIELDS = (
+    'file_id', 'file_timestamp', 'file_path', 'file_size', 'file_type', 'access_frequency',
+    'speaker_name', 'version', 'permissions', 'checksum', 'creation_date', 'description',
+)
+
+# Tag at the start of a file written by dump_nodes
+RECORDS_FORMAT = 'file-records-v1'
+
+def iter_in_order(root):
+    """
+    Iterate over the nodes of a tree in file_id order.
+
+    The traversal uses an explicit stack, so it does not hit the recursion limit on
+    degenerate (list-shaped) trees.
+
+    Args:
+        root (TreeNode): The root of the tree, or None.
+
+    Yields:
+        TreeNode: The nodes, sorted by file_id.
+    """
+    stack = []
+    current = root
+    while stack or current is not None:
+        # Go as far left as possible, remembering the path back up
+        while current is not None:
+            stack.append(current)
+            current = current.left
+        current = stack.pop()
+        yield current
+        current = current.right
+
+def dump_nodes(nodes, file):
+    """
+    Write nodes to a binary file as flat records.
+
+    Each node is stored as a tuple of its NODE_FIELDS values, so the file contains only
+    plain values: no TreeNode objects and no left/right links. Writing is not recursive,
+    and the file does not depend on the TreeNode class layout.
+
+    Args:
+        nodes (iterable): The nodes to write, in file_id order.
+        file (file object): The file opened for binary writing.
+    """
+    records = [tuple(getattr(node, field) for field in NODE_FIELDS) for node in nodes]
+    pickle.dump((RECORDS_FORMAT, NODE_FIELDS, records), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_nodes(file):
+    """
+    Read the nodes written by dump_nodes, in file_id order.
+
+    Files written before the record format (a pickled TreeNode tree, or a pickled list of
+    TreeNodes) are still accepted.
+
+    Args:
+        file (file object): The file opened for binary reading.
+
+    Returns:
+        list: New, unlinked TreeNode objects, sorted by file_id.
+    """
+    data = pickle.load(file)
+    if isinstance(data, TreeNode):
+        nodes = list(iter_in_order(data))
+        for node in nodes:
+            node.left = node.right = None
+        return nodes
+    if isinstance(data, list):
+        return data
+
+    _, fields, records = data
+    if tuple(fields) == NODE_FIELDS:
+        # NODE_FIELDS follows the order of the TreeNode arguments
+        return [TreeNode(*record) for record in records]
+    known = [(i, field) for i, field in enumerate(fields) if field in NODE_FIELDS]
+    return [TreeNode(**{field: record[i] for i, field in known}) for record in records]
+
 class BinarySearchTree:
     def __init__(self, serialized_file=None):
         """
@@ -68,6 +175,13 @@ class BinarySearchTree:
         # Set the path to the serialized file
         self.serialized_file = serialized_file or os.path.join(data_directory, 'bst_data.pkl')
         self.root = None
+
+        # Hash index from file_id to node, kept in sync with the tree, so that lookups are a
+        # dict probe instead of a walk down the tree; the tree keeps the file_id order
+        self._nodes = {}
+
+        # Set when the tree changes in memory, cleared when it matches the serialized file
+        self.dirty = False
         
         # Load the BST from the serialized file, if it exists
         self.deserialize_bst()
@@ -76,21 +190,27 @@ class BinarySearchTree:
         """
         Load the BST from a file.
 
+        The nodes are read in file_id order and linked into a balanced tree, whatever
+        order they were originally inserted in.
+
         If the file does not exist, the BST will be empty.
         """
         if os.path.exists(self.serialized_file):
             with open(self.serialized_file, 'rb') as file:
-                self.root = pickle.load(file)
-            print(f"BST loaded from {self.serialized_file}")
+                nodes = load_nodes(file)
+            self.root = self._build_balanced(nodes, 0, len(nodes))
+            self._nodes = {node.file_id: node for node in nodes}
+            self.dirty = False
+            logger.info("BST loaded from %s", self.serialized_file)
         else:
-            print(f"No serialized BST file found at {self.serialized_file}. Starting with an empty BST.")
+            logger.info("No serialized BST file found at %s. Starting with an empty BST.", self.serialized_file)
                 
     def serialize_bst(self, filename=None):
         """
         Serialize the Binary Search Tree and save it to a file.
 
-        The BST is serialized using the pickle library, which converts the tree's
-        structure and data into a byte stream that can be written to a file.
+        The nodes are written in order as flat records (see dump_nodes) rather than
+        pickling the linked tree, which is faster and does not recurse through the tree.
 
         Args:
             filename (str): The name of the file where the BST will be saved.
@@ -105,14 +225,36 @@ class BinarySearchTree:
             filename = filename or self.serialized_file
             if os.path.exists(filename):
                 os.remove(filename)
-                print(f"BST is empty. Deleted {filename} if it existed.")
+                logger.info("BST is empty. Deleted %s.", filename)
+            self.dirty = False
             return
 
         # If the tree is not empty, proceed with serialization
         filename = filename or self.serialized_file
         with open(filename, 'wb') as file:
-            pickle.dump(self.root, file)
-        print(f"BST serialized and saved to {filename}")
+            dump_nodes(self.in_order(), file)
+        self.dirty = False
+        logger.info("BST serialized and saved to %s", filename)
+
+    def _build_balanced(self, nodes, start, end):
+        """
+        Link a sorted slice of nodes into a balanced subtree.
+
+        Args:
+            nodes (list): Unlinked nodes sorted by file_id.
+            start (int): The index of the first node of the slice.
+            end (int): The index one past the last node of the slice.
+
+        Returns:
+            TreeNode or None: The root of the subtree.
+        """
+        if start >= end:
+            return None
+        middle = (start + end) // 2
+        node = nodes[middle]
+        node.left = self._build_balanced(nodes, start, middle)
+        node.right = self._build_balanced(nodes, middle + 1, end)
+        return node
 
     def insert(self, 
                file_id, 
@@ -152,19 +294,23 @@ class BinarySearchTree:
         Returns:
             TreeNode or None: The newly inserted node, or the updated node if the file_id already exists.
         """
+        # Keyword arguments: TreeNode takes speaker_name between access_frequency and version
         new_node = TreeNode(
-            file_id, 
-            file_timestamp, 
-            file_path, 
-            file_size, 
-            file_type, 
-            access_frequency, 
-            version, 
-            permissions, 
-            checksum, 
-            creation_date, 
-            description
+            file_id=file_id,
+            file_timestamp=file_timestamp,
+            file_path=file_path,
+            file_size=file_size,
+            file_type=file_type,
+            access_frequency=access_frequency,
+            version=version,
+            permissions=permissions,
+            checksum=checksum,
+            creation_date=creation_date,
+            description=description
             )
+        self.dirty = True
+        if file_id not in self._nodes:
+            self._nodes[file_id] = new_node
         if self.root is None:
             # If the tree is empty, the new node becomes the root
             self.root = new_node
@@ -199,37 +345,37 @@ class BinarySearchTree:
                 current.description = description
                 return current  # Return the updated node
                     
-    def search(self, file_id):
+    def bulk_insert(self, records):
         """
-        Search for a node with a given file_id in the binary search tree.
-        
+        Insert many files at once and rebuild the tree balanced.
+
+        The new records and the existing nodes are sorted by file_id and linked into a
+        balanced tree in one pass, instead of inserting one at a time (which degenerates
+        into a linked list when the records arrive in file_id order). A record whose
+        file_id already exists updates that node, as insert does.
+
         Args:
-            file_id (int): The file_id to search for.
-            
-        Returns:
-            TreeNode or None: The node if found, None otherwise.
+            records (iterable): Dictionaries of TreeNode fields; each must contain file_id,
+                                file_timestamp and file_path.
         """
-        # If the tree is empty, return None
-        if self.root is None:
-            return None
-        # Otherwise, search the tree iteratively
-        current = self.root
-        while current is not None:
-            # If the current node's file_id matches the target file_id, return the file_timestamp
-            if file_id == current.file_id:
-                return current
-            # If the target file_id is less than the current node's file_id, search the left subtree
-            elif file_id < current.file_id:
-                current = current.left
-            # If the target file_id is greater than the current node's file_id, search the right subtree
+        nodes = self._nodes
+        for record in records:
+            node = nodes.get(record['file_id'])
+            if node is None:
+                nodes[record['file_id']] = TreeNode(**record)
             else:
-                current = current.right
-        # If the target file_id is not found in the tree, return None
-        return None
+                for field, value in record.items():
+                    setattr(node, field, value)
+            self.dirty = True
 
-    def search_recursive(self, file_id):
+        ordered = [nodes[file_id] for file_id in sorted(nodes)]
+        self.root = self._build_balanced(ordered, 0, len(ordered))
+
+    def search(self, file_id):
         """
-        A recursive function to search for a node with a given file_id.
+        Search for a node with a given file_id in the binary search tree.
+
+        The node is looked up in the hash index kept alongside the tree.
         
         Args:
             file_id (int): The file_id to search for.
@@ -237,132 +383,81 @@ class BinarySearchTree:
         Returns:
             TreeNode or None: The node if found, None otherwise.
         """
-        # If the tree is empty, return None
-        if self.root is None:
-            return None
-        # Otherwise, search the tree recursively
-        else:
-            return self._search_recursive(self.root, file_id)
-        
-    def _search_recursive(self, current, file_id):
+        return self._nodes.get(file_id)
+
+    def search_recursive(self, file_id):
         """
-        A recursive function to search for a node with a given file_id.
+        Search for a node with a given file_id.
+
+        Kept for existing callers; the search is a hash lookup (see search), so it cannot
+        hit the recursion limit on a degenerate tree.
         
         Args:
-            current (TreeNode): The current node being searched.
             file_id (int): The file_id to search for.
             
         Returns:
             TreeNode or None: The node if found, None otherwise.
         """
-        # If the current node is None, return None
-        if current is None:
-            return None
-        # If the current node's file_id matches the target file_id, return the node
-        elif current.file_id == file_id:
-            return current
-        # If the target file_id is greater than the current node's file_id, search the right subtree
-        elif current.file_id < file_id:
-            return self._search_recursive(current.right, file_id)
-        # If the target file_id is less than the current node's file_id, search the left subtree
-        else:
-            return self._search_recursive(current.left, file_id)
-            
-        
+        return self.search(file_id)
+
     def delete_node(self, file_id):
         """
         Delete a node from the binary search tree.
         
-        If the tree is empty, this function does nothing.
+        If the tree is empty or the file_id is not found, this function does nothing.
+        A node with two children is replaced by its in-order successor, which keeps all
+        of its own metadata.
         
         Args:
             file_id (int): The file_id of the node to delete.
         """
-        if self.root is None:
+        # Find the node to delete and its parent
+        parent = None
+        current = self.root
+        while current is not None and current.file_id != file_id:
+            parent = current
+            current = current.left if file_id < current.file_id else current.right
+        if current is None:
             return
+        del self._nodes[file_id]
+
+        if current.left is not None and current.right is not None:
+            # Node with two children: unlink the in-order successor (smallest in the right subtree)
+            successor_parent = current
+            successor = current.right
+            while successor.left is not None:
+                successor_parent = successor
+                successor = successor.left
+            if successor_parent is not current:
+                successor_parent.left = successor.right
+                successor.right = current.right
+            successor.left = current.left
+            replacement = successor
+        else:
+            # Node with at most one child: the child takes its place
+            replacement = current.left if current.left is not None else current.right
+
+        # Link the replacement into the parent
+        if parent is None:
+            self.root = replacement
+        elif parent.left is current:
+            parent.left = replacement
         else:
-            self.root = self._delete_recursive(self.root, file_id)
+            parent.right = replacement
+        self.dirty = True
 
-    def _delete_recursive(self, node, file_id):
+    def in_order(self):
         """
-        A recursive function to delete a node from the binary search tree.
-        
-        Args:
-            node (TreeNode): The current node being traversed.
-            file_id (int): The file_id of the node to delete.
-            
-        Returns:
-            TreeNode: The root of the modified tree after the deletion.
+        Iterate over the nodes of the tree in file_id order.
+
+        Yields:
+            TreeNode: The nodes, sorted by file_id.
         """
-        if node is None:
-            return node
-        
-        # Traverse the tree to find the node to delete
-        if file_id < node.file_id:
-            # Search the left subtree
-            node.left = self._delete_recursive(node.left, file_id)
-        elif file_id > node.file_id:
-            # Search the right subtree
-            node.right = self._delete_recursive(node.right, file_id)
-        else:
-            # Node found, perform deletion
-            if node.left is None and node.right is None:
-                # Case 1: Node with no children (Leaf Node)
-                return None
-            elif node.left is None:
-                # Case 2: Node with one child
-                return node.right
-            elif node.right is None:
-                return node.left
-            
-            # Case 3: Node with two children
-            # Find the in-order successor (smallest in the right subtree)
-            min_larger_node = self._find_min(node.right)
-            
-            # Copy the in-order successor's content to this node
-            node.file_id = min_larger_node.file_id
-            node.file_timestamp = min_larger_node.file_timestamp
-            
-            # Delete the in-order successor
-            node.right = self._delete_recursive(node.right, min_larger_node.file_id)
-            
-        return node
-            
-    def _find_min(self, node):
-        while node.left is not None:
-            node = node.left
-        return node
-    
+        return iter_in_order(self.root)
+
     def print_data(self):
-        """TBD"""
+        """Print the file_id and timestamp of every node, in file_id order."""
         if self.root is None:
             print("The data base is empty...")
-        else:
-            self._print_recursive(self.root)
-            
-    def _print_recursive(self, node):
-        """TBD"""
-        if node is not None:
-            # Traverse the left subtree first
-            self._print_recursive(node.left)
-            # Print the current node's data
+        for node in self.in_order():
             print(f"File ID: {node.file_id}, Last Modified: {node.file_timestamp}")
-            # Traverse the right subtree
-            self._print_recursive(node.right)
-        
-
-            
-                    
-
-                
-                
-                
-                
-                    
-            
-            
-
-            
-
-            
-                
\ No newline at end of file
@@ -0,0 +1,33 @@
+import os
+
+from file_management.bst import BinarySearchTree
+from file_management.sorted_index import SortedFileIndex
+
+# File index implementations, selectable by name. Both keep a file_id hash or bisect lookup
+# and read and write the same record format, so they can be switched over the same file.
+FILE_INDEX_TYPES = {
+    'bst': BinarySearchTree,
+    'sorted': SortedFileIndex,
+}
+
+DEFAULT_FILE_INDEX = 'bst'
+
+# The index file shared by both implementations
+DEFAULT_INDEX_FILE = os.path.join('data', 'bst_data.pkl')
+
+def open_file_index(kind=DEFAULT_FILE_INDEX, serialized_file=None):
+    """
+    Load the file metadata index with the given implementation.
+
+    Args:
+        kind (str): The implementation, one of FILE_INDEX_TYPES: 'bst' (the balanced binary
+                    search tree) or 'sorted' (sorted arrays searched with bisect).
+        serialized_file (str): The path to the serialized index. If None, the default
+                               index file is used, whichever the implementation.
+
+    Returns:
+        BinarySearchTree or SortedFileIndex: The loaded index.
+    """
+    if kind not in FILE_INDEX_TYPES:
+        raise ValueError(f"Unknown file index {kind!r}, expected one of {sorted(FILE_INDEX_TYPES)}.")
+    return FILE_INDEX_TYPES[kind](serialized_file or DEFAULT_INDEX_FILE)
@@ -1,11 +1,67 @@
 from abc import ABC, abstractmethod
+import functools
 import os
+import sys
 import time
 import hashlib
 
 import file_management.bst as bst
 
 
+@functools.lru_cache(maxsize=1024)
+def _directory_hash(directory):
+    """
+    Return the md5 state after hashing a directory prefix, shared by every file under it.
+
+    Args:
+        directory (str): The directory prefix of a relative path, including its trailing separator.
+
+    Returns:
+        hashlib._Hash: The md5 object fed with the prefix; callers must copy it before updating.
+    """
+    return hashlib.md5(directory.encode())
+
+
+@functools.lru_cache(maxsize=4096)
+def file_id_for_path(file_path):
+    """
+    Derive the file ID of a file from its path relative to the base directory.
+
+    The ID is the md5 hex digest of the path. It is not a security boundary, but it is
+    persisted in the file index and recomputed by the services to look up models, so it
+    must stay stable across versions. IDs are memoized, since the same paths are added,
+    updated and looked up repeatedly, and sibling files resume from the cached md5 state
+    of their directory, so only the file name is hashed for each new file.
+
+    Args:
+        file_path (str): The relative path of the file.
+
+    Returns:
+        str: The file ID.
+    """
+    directory, separator, name = file_path.rpartition('/')
+    hasher = _directory_hash(directory + separator).copy()
+    hasher.update(name.encode())
+    return hasher.hexdigest()
+
+
+@functools.lru_cache(maxsize=64)
+def _read_binary_cached(file_path, mtime_ns, size):
+    """
+    Read a binary file, caching its content by path, modification time and size.
+
+    Args:
+        file_path (str): The path to the file.
+        mtime_ns (int): The modification time of the file, in nanoseconds.
+        size (int): The size of the file in bytes.
+
+    Returns:
+        bytes: The content of the file.
+    """
+    with open(file_path, 'rb') as f:
+        return f.read()
+
+
 class FileManagementBase(ABC):
     @abstractmethod
     def add_file(self, file_path, file_content):
@@ -64,7 +120,8 @@ class FileManagementInterface(FileManagementBase):
             base_directory (str): The base directory that will be used to store files.
         """
         self.bst = bst
-        self.base_directory = base_directory
+        # Resolve the base directory once; it does not change afterwards
+        self.base_directory = os.path.abspath(base_directory)
         
         # Ensure the base directory exists
         if not os.path.exists(self.base_directory):
@@ -82,9 +139,6 @@ class FileManagementInterface(FileManagementBase):
         if os.path.isabs(file_path) or file_path.startswith('configs/'):
             raise ValueError("The file path must be relative and should not start with 'configs/'.")
 
-        # Convert to an absolute path
-        self.base_directory = os.path.abspath(self.base_directory)
-
         # Ensure file_path is relative to base_directory
         if os.path.isabs(file_path):
             # Strip leading slash to make it relative
@@ -102,8 +156,11 @@ class FileManagementInterface(FileManagementBase):
         else:
             file_mode = 'w'
 
-        # Generate a consistent file ID using md5 hash
-        file_id = hashlib.md5(file_path.encode()).hexdigest()
+        # Generate a consistent file ID from the relative path
+        file_id = file_id_for_path(file_path)
+
+        # Get the file extension; it is interned so that nodes of the same type share one string
+        file_type = sys.intern(os.path.splitext(file_path)[1][1:])
 
         # Get the current timestamp for when the file is added
         file_timestamp = int(time.time())
@@ -112,9 +169,8 @@ class FileManagementInterface(FileManagementBase):
             # Write the file to the directory
             with open(full_path, file_mode) as f:
                 f.write(file_content)
-                
-            # Calculate the actual file size after writing 
-            file_size = os.path.getsize(full_path)
+                # The file size is the position after writing, without a separate stat call
+                file_size = f.tell()
 
             # Insert metadata into the BST
             self.bst.insert(
@@ -122,7 +178,7 @@ class FileManagementInterface(FileManagementBase):
                 file_timestamp=file_timestamp,
                 file_path=full_path,
                 file_size=file_size,
-                file_type=file_path.split('.')[-1],  # Get the file extension
+                file_type=file_type,
                 creation_date=file_timestamp,
                 description=f"Added file at {full_path}"
             )
@@ -130,17 +186,28 @@ class FileManagementInterface(FileManagementBase):
         except IOError as io_error:
             print(f"Error writing file {full_path}: {io_error}")
             # Optionally: Remove the file if it was created before the error occurred
-            if os.path.exists(full_path):
-                os.remove(full_path)
+            self._remove_partial_file(full_path)
             raise io_error
 
         except Exception as e:
             print(f"An unexpected error occurred: {e}")
             # Optionally: Clean up by removing the file if it was written
-            if os.path.exists(full_path):
-                os.remove(full_path)
+            self._remove_partial_file(full_path)
             raise e  # Re-raise the actual caught exception
 
+    @staticmethod
+    def _remove_partial_file(full_path):
+        """
+        Remove a file left behind by a failed write, if it was created.
+
+        Args:
+            full_path (str): The path to the file.
+        """
+        try:
+            os.remove(full_path)
+        except FileNotFoundError:
+            pass
+
             
     def update_file(self, file_id, new_content):
         """
@@ -165,6 +232,7 @@ class FileManagementInterface(FileManagementBase):
             node.file_timestamp = int(time.time())
             node.file_size = len(new_content)
             node.access_frequency += 1
+            self.bst.dirty = True
         
         except FileNotFoundError as error:
             # Handle FileNotFoundError
@@ -235,21 +303,7 @@ class FileManagementInterface(FileManagementBase):
                 raise FileNotFoundError(f"No file with ID {file_id} found in the BST.")
             
             # Return the metadata as a dictionary
-            metadata = {
-                "file_id": node.file_id,
-                "file_timestamp": node.file_timestamp,
-                "file_path": node.file_path,
-                "file_size": node.file_size,
-                "file_type": node.file_type,
-                "access_frequency": node.access_frequency,
-                "version": node.version,
-                "permissions": node.permissions,
-                "checksum": node.checksum,
-                "creation_date": node.creation_date,
-                "description": node.description,
-            }
-            
-            return metadata
+            return self._node_to_metadata(node)
         
         except FileNotFoundError as error:
             print(f"Error: {error}")
@@ -268,36 +322,65 @@ class FileManagementInterface(FileManagementBase):
         Returns:
             list: A list of dictionaries, each containing metadata for a file.
         """
-        def in_order_traversal(node):
-            """
-            Perform an in-order traversal of the BST.
-            
-            This method traverses the BST in-order and returns a list of dictionaries, each containing metadata for a file.
-            
-            Args:
-                node (TreeNode): The current node being traversed.
-            
-            Returns:
-                list: A list of dictionaries, each containing metadata for a file.
-            """
-            if node is None:
-                return []
-            
-            # Traverse the left subtree
-            left_subtree = in_order_traversal(node.left)
-            
-            # Get the metadata for the current node
-            current_node_metadata = [self.get_file_metadata(node.file_id)]
-            
-            # Traverse the right subtree
-            right_subtree = in_order_traversal(node.right)
-            
-            # Combine the results from the left subtree, the current node, and the right subtree
-            return left_subtree + current_node_metadata + right_subtree
+        return list(self.iter_all_files())
 
-        
-        # Start the traversal from the root of the BST
-        return in_order_traversal(self.bst.root)
+    def iter_all_files(self):
+        """
+        Iterate over the metadata of all files in the BST, in file_id order.
+
+        Unlike list_all_files, the dictionaries are produced one at a time during the
+        traversal, so callers that only print or filter them never hold all of them.
+
+        Yields:
+            dict: A dictionary containing metadata for a file.
+        """
+        # The traversal already yields the nodes, so build the metadata from them directly
+        # instead of searching the BST again for each file_id
+        for node in self.bst.in_order():
+            yield self._node_to_metadata(node)
+
+    def iter_files_with_prefix(self, prefix):
+        """
+        Iterate over the metadata of the files whose path starts with a prefix, in file_id order.
+
+        The metadata dictionary is only built for the matching files, so listing one folder
+        (e.g. "metadata/") does not pay for every other file in the BST.
+
+        Args:
+            prefix (str): The prefix of the file paths, relative to the base directory.
+
+        Yields:
+            dict: A dictionary containing metadata for a matching file.
+        """
+        full_prefix = os.path.join(self.base_directory, prefix)
+        for node in self.bst.in_order():
+            if node.file_path.startswith(full_prefix):
+                yield self._node_to_metadata(node)
+
+    @staticmethod
+    def _node_to_metadata(node):
+        """
+        Build the metadata dictionary of a BST node.
+
+        Args:
+            node (TreeNode): The node holding the file's metadata.
+
+        Returns:
+            dict: A dictionary containing the file's metadata.
+        """
+        return {
+            "file_id": node.file_id,
+            "file_timestamp": node.file_timestamp,
+            "file_path": node.file_path,
+            "file_size": node.file_size,
+            "file_type": node.file_type,
+            "access_frequency": node.access_frequency,
+            "version": node.version,
+            "permissions": node.permissions,
+            "checksum": node.checksum,
+            "creation_date": node.creation_date,
+            "description": node.description,
+        }
 
     def get_file_content(self, file_id):
         """
@@ -316,14 +399,16 @@ class FileManagementInterface(FileManagementBase):
                 # If the file is not found in the BST, raise a FileNotFoundError
                 raise FileNotFoundError(f"No file with ID {file_id} found in the BST.")
             
-            # Open the file and read its content based on file type
+            # Read the content from the file based on file type
             if node.file_path.endswith('.pkl') or node.file_path.endswith('.npy'):
-                file_mode = 'rb'  # Read as binary for GMM models or MFCC files
-            else:
-                file_mode = 'r'  # Read as text for metadata or other text files
+                # GMM models and MFCC files are read as binary, through a cache keyed by the
+                # file's modification time and size, so a model that did not change on disk
+                # is not read again on every recognition
+                stat = os.stat(node.file_path)
+                return _read_binary_cached(node.file_path, stat.st_mtime_ns, stat.st_size)
 
-            # Read the content from the file
-            with open(node.file_path, file_mode) as f:
+            # Metadata and other text files are read as text and not cached
+            with open(node.file_path, 'r') as f:
                 return f.read()
 
         except FileNotFoundError as error:
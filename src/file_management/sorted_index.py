@@ -0,0 +1,187 @@
+import bisect
+import logging
+import os
+
+from file_management.bst import TreeNode, dump_nodes, load_nodes
+
+logger = logging.getLogger(__name__)
+
+class SortedFileIndex:
+    """
+    File metadata index backed by a sorted list of keys and a parallel list of nodes.
+
+    Drop-in alternative to BinarySearchTree for read-heavy use: lookups are a binary search
+    over the sorted keys (bisect, in C) instead of a walk down an unbalanced tree, so they
+    stay O(log N) regardless of insertion order. Inserts and deletes shift the lists, which
+    is a single memmove per operation.
+    """
+    def __init__(self, serialized_file=None):
+        """
+        Initialize a new SortedFileIndex object.
+
+        Args:
+            serialized_file (str): The path to the file containing the serialized index.
+                                   If None, 'data/file_index.pkl' is used.
+        """
+        # Ensure the data directory exists
+        data_directory = 'data'
+        os.makedirs(data_directory, exist_ok=True)
+
+        self.serialized_file = serialized_file or os.path.join(data_directory, 'file_index.pkl')
+        self.keys = []
+        self.rows = []
+
+        # Set when the index changes in memory, cleared when it matches the serialized file
+        self.dirty = False
+
+        # Load the index from the serialized file, if it exists
+        self.deserialize_bst()
+
+    def deserialize_bst(self):
+        """
+        Load the index from a file.
+
+        The file holds the nodes in key order, in the same record format as
+        BinarySearchTree files. If the file does not exist, the index will be empty.
+        """
+        if os.path.exists(self.serialized_file):
+            with open(self.serialized_file, 'rb') as file:
+                self.rows = load_nodes(file)
+            self.keys = [node.file_id for node in self.rows]
+            self.dirty = False
+            logger.info("Index loaded from %s", self.serialized_file)
+        else:
+            logger.info("No serialized index file found at %s. Starting with an empty index.", self.serialized_file)
+
+    def serialize_bst(self, filename=None):
+        """
+        Save the index to a file.
+
+        Args:
+            filename (str): The name of the file where the index will be saved.
+                            If None, it will use the default `self.serialized_file`.
+        """
+        filename = filename or self.serialized_file
+        if not self.rows:
+            # If the index is empty, delete the file if it exists
+            if os.path.exists(filename):
+                os.remove(filename)
+                logger.info("Index is empty. Deleted %s.", filename)
+            self.dirty = False
+            return
+
+        with open(filename, 'wb') as file:
+            dump_nodes(self.rows, file)
+        self.dirty = False
+        logger.info("Index serialized and saved to %s", filename)
+
+    def insert(self,
+               file_id,
+               file_timestamp,
+               file_path,
+               file_size=None,
+               file_type=None,
+               access_frequency=0,
+               version=None,
+               permissions=None,
+               checksum=None,
+               creation_date=None,
+               description=None):
+        """
+        Insert a new entry into the index, or update the entry if the file_id already exists.
+
+        Args:
+            file_id (str): The unique identifier of the file.
+            file_timestamp (int): The timestamp when the file was last modified.
+            file_path (str): The path to the file.
+            file_size (int): The size of the file in bytes.
+            file_type (str): Type of file (e.g., 'wav', 'npy', 'pkl', 'txt')
+            access_frequency (int): The number of times the file has been accessed.
+            version (str): The version of the file.
+            permissions (str): The permissions of the file.
+            checksum (str): The checksum of the file.
+            creation_date (int): The timestamp when the file was created.
+            description (str): A description of the file.
+
+        Returns:
+            TreeNode: The newly inserted node, or the updated node if the file_id already exists.
+        """
+        self.dirty = True
+        i = bisect.bisect_left(self.keys, file_id)
+        if i < len(self.keys) and self.keys[i] == file_id:
+            # Update the existing entry, as BinarySearchTree.insert does
+            node = self.rows[i]
+            node.file_timestamp = file_timestamp
+            node.file_path = file_path
+            node.file_size = file_size
+            node.file_type = file_type
+            node.version = version
+            node.permissions = permissions
+            node.checksum = checksum
+            node.creation_date = creation_date
+            node.description = description
+            return node
+
+        node = TreeNode(
+            file_id=file_id,
+            file_timestamp=file_timestamp,
+            file_path=file_path,
+            file_size=file_size,
+            file_type=file_type,
+            access_frequency=access_frequency,
+            version=version,
+            permissions=permissions,
+            checksum=checksum,
+            creation_date=creation_date,
+            description=description
+        )
+        self.keys.insert(i, file_id)
+        self.rows.insert(i, node)
+        return node
+
+    def search(self, file_id):
+        """
+        Search for the entry with a given file_id.
+
+        Args:
+            file_id (str): The file_id to search for.
+
+        Returns:
+            TreeNode or None: The node if found, None otherwise.
+        """
+        i = bisect.bisect_left(self.keys, file_id)
+        if i < len(self.keys) and self.keys[i] == file_id:
+            return self.rows[i]
+        return None
+
+    # Same interface as BinarySearchTree
+    search_recursive = search
+
+    def delete_node(self, file_id):
+        """
+        Delete the entry with a given file_id. Does nothing if it does not exist.
+
+        Args:
+            file_id (str): The file_id of the entry to delete.
+        """
+        i = bisect.bisect_left(self.keys, file_id)
+        if i < len(self.keys) and self.keys[i] == file_id:
+            del self.keys[i]
+            del self.rows[i]
+            self.dirty = True
+
+    def in_order(self):
+        """
+        Iterate over the entries in file_id order.
+
+        Returns:
+            iterator: The nodes, sorted by file_id.
+        """
+        return iter(list(self.rows))
+
+    def print_data(self):
+        """Print the file_id and timestamp of every entry, in file_id order."""
+        if not self.rows:
+            print("The data base is empty...")
+        for node in self.rows:
+            print(f"File ID: {node.file_id}, Last Modified: {node.file_timestamp}")
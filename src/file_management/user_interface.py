@@ -3,7 +3,7 @@ import argparse
 import json
 from abc import ABC, abstractmethod
 from file_management.file_management import FileManagementInterface
-from file_management.bst import BinarySearchTree
+from file_management.file_index import DEFAULT_FILE_INDEX, open_file_index
 import os
 
 #Command interface
@@ -113,8 +113,7 @@ class ListAllFilesCommand(CommandInterface):
 
         This method lists all files and their metadata.
         """
-        files_metadata = self.file_management.list_all_files()
-        for metadata in files_metadata:
+        for metadata in self.file_management.iter_all_files():
             print(metadata)
 
 
@@ -197,7 +196,7 @@ def main():
         print(f"Created base directory: {base_directory}")
         
     # Initialize necessary components
-    bst = BinarySearchTree()
+    bst = open_file_index(config.get('file_index', DEFAULT_FILE_INDEX))
     file_management = FileManagementInterface(bst, base_directory)
     ui = UserInterface()
 
@@ -222,8 +221,9 @@ def main():
 
     # Add elif blocks for other commands
 
-    # Serialize the BST before exiting the program
-    bst.serialize_bst()
+    # Serialize the BST before exiting the program, unless the command only read it
+    if bst.dirty:
+        bst.serialize_bst()
 
 # 6. Main Loop (if needed)
 # This could be implemented if you want an interactive shell-like interface
@@ -0,0 +1,259 @@
+# Expectation-Maximization for Gaussian mixtures with diagonal covariances.
+#
+# This is the case GMMFactory builds by default. sklearn's GaussianMixture handles every
+# covariance type through generic code: it recomputes X**2 on every E-step, takes the
+# log-sum-exp through scipy.special.logsumexp (several temporaries per call), and builds new
+# responsibility arrays each iteration. For diagonal covariances the E-step is two matrix
+# products against the precomputed X and X**2, and the M-step is two more, so here all four
+# run as BLAS calls into buffers allocated once per fit. The initialization (k-means labels),
+# stopping rule (change of the mean log-likelihood below tol) and regularization match
+# sklearn, and the result is returned as a fitted GaussianMixture, so predict, score and
+# pickled models behave exactly as before.
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.mixture import GaussianMixture
+
+
+def _m_step(X, X_squared, resp, reg_covar):
+    """
+    Estimate the weights, means and diagonal covariances from the responsibilities.
+
+    Args:
+        X (np.ndarray): The data (shape: [n_samples, n_features]).
+        X_squared (np.ndarray): X ** 2.
+        resp (np.ndarray): The responsibilities (shape: [n_samples, n_components]).
+        reg_covar (float): Non-negative regularization added to the covariances.
+
+    Returns:
+        tuple: The weights, means and covariances of the components.
+    """
+    nk = resp.sum(axis=0) + 10 * np.finfo(resp.dtype).eps
+    means = (resp.T @ X) / nk[:, np.newaxis]
+    covariances = (resp.T @ X_squared) / nk[:, np.newaxis]
+    covariances -= means * means
+    covariances += reg_covar
+    return nk / X.shape[0], means, covariances
+
+
+def _log_prob_terms(weights, means, covariances):
+    """
+    Precompute the per-component terms of the weighted log-probabilities.
+
+    For diagonal covariances the weighted log-probability of x under component k is
+    x @ linear[:, k] + x**2 @ quadratic[:, k] + constant[k].
+
+    Args:
+        weights (np.ndarray): The weights of the components.
+        means (np.ndarray): The means of the components.
+        covariances (np.ndarray): The diagonal covariances of the components.
+
+    Returns:
+        tuple: The linear (shape: [n_features, n_components]) and quadratic terms (same shape),
+               and the constants (shape: [n_components]).
+    """
+    precisions = 1.0 / covariances
+    # Per-component constant: log weight - 0.5 * (n_features * log(2 pi) + log|cov| + mu' P mu)
+    constant = np.log(weights) - 0.5 * (
+        means.shape[1] * np.log(2 * np.pi) + np.log(covariances).sum(axis=1)
+        + (means * means * precisions).sum(axis=1)
+    )
+    linear = np.ascontiguousarray((means * precisions).T)
+    quadratic = np.ascontiguousarray(-0.5 * precisions.T)
+    return linear, quadratic, constant
+
+
+def _log_sum_exp(log_prob, normalize=False):
+    """
+    Compute the log-sum-exp of weighted log-probabilities over the components, in place.
+
+    Args:
+        log_prob (np.ndarray): The weighted log-probabilities (shape: [n_samples, n_components]);
+                               the buffer is overwritten.
+        normalize (bool): Leave the responsibilities (the normalized probabilities) in log_prob.
+
+    Returns:
+        np.ndarray: The log-likelihood of each sample under the mixture.
+    """
+    log_max = log_prob.max(axis=1)
+    log_prob -= log_max[:, np.newaxis]
+    np.exp(log_prob, out=log_prob)
+    total = log_prob.sum(axis=1)
+    if normalize:
+        log_prob /= total[:, np.newaxis]
+    return np.log(total) + log_max
+
+
+def _e_step(X, X_squared, weights, means, covariances, resp):
+    """
+    Compute the responsibilities of the components for every sample, in place.
+
+    Args:
+        X (np.ndarray): The data (shape: [n_samples, n_features]).
+        X_squared (np.ndarray): X ** 2.
+        weights (np.ndarray): The weights of the components.
+        means (np.ndarray): The means of the components.
+        covariances (np.ndarray): The diagonal covariances of the components.
+        resp (np.ndarray): Output buffer for the responsibilities (shape: [n_samples, n_components]).
+
+    Returns:
+        float: The mean log-likelihood of the samples under the mixture.
+    """
+    linear, quadratic, constant = _log_prob_terms(weights, means, covariances)
+    np.dot(X, linear, out=resp)
+    resp += X_squared @ quadratic
+    resp += constant
+    return float(np.mean(_log_sum_exp(resp, normalize=True)))
+
+
+class DiagGMMScorer:
+    def __init__(self, model):
+        """
+        Precompute the terms needed to score data under a fitted diagonal GaussianMixture.
+
+        GaussianMixture.score recomputes the log-determinants and the precision-weighted
+        means on every call; a model is trained once and scored on every recognition, so
+        they are computed here once per model instead.
+
+        Args:
+            model (GaussianMixture): A fitted GaussianMixture with covariance_type='diag'.
+        """
+        self.model = model
+        self.linear, self.quadratic, self.constant = _log_prob_terms(
+            model.weights_, model.means_, model.covariances_)
+
+    def score_samples(self, X):
+        """
+        Compute the log-likelihood of each sample under the mixture.
+
+        Args:
+            X (np.ndarray): The data (shape: [n_samples, n_features]).
+
+        Returns:
+            np.ndarray: The log-likelihood of each sample (shape: [n_samples]).
+        """
+        # Score in the precision of the model (float32 for trained models): float64 data
+        # would otherwise promote both matrix products, and strided data would be copied
+        # by BLAS anyway
+        X = np.require(X, dtype=self.linear.dtype, requirements='C')
+        log_prob = X @ self.linear
+        log_prob += (X * X) @ self.quadratic
+        log_prob += self.constant
+        return _log_sum_exp(log_prob)
+
+    def score(self, X):
+        """
+        Compute the mean log-likelihood of the samples, as GaussianMixture.score does.
+
+        Args:
+            X (np.ndarray): The data (shape: [n_samples, n_features]).
+
+        Returns:
+            float: The mean log-likelihood.
+        """
+        return float(np.mean(self.score_samples(X), dtype=np.float64))
+
+
+class StackedDiagGMMScorer:
+    def __init__(self, scorers):
+        """
+        Stack the scoring terms of several diagonal mixtures to score data under all of them at once.
+
+        Scoring every enrolled speaker model one by one runs two small matrix products per
+        model over the same data. With the terms of all models side by side, the
+        weighted log-probabilities of every component of every model come out of two
+        matrix products, which make better use of BLAS and read the data once.
+
+        Args:
+            scorers (list of DiagGMMScorer): The scorers of the mixtures, in output order.
+        """
+        self.scorers = scorers
+        self.linear = np.concatenate([scorer.linear for scorer in scorers], axis=1)
+        self.quadratic = np.concatenate([scorer.quadratic for scorer in scorers], axis=1)
+        self.constant = np.concatenate([scorer.constant for scorer in scorers])
+        # Component range of each mixture in the stacked terms
+        self.bounds = np.cumsum([0] + [scorer.constant.size for scorer in scorers])
+
+    def score(self, X):
+        """
+        Compute the mean log-likelihood of the samples under each mixture.
+
+        Args:
+            X (np.ndarray): The data (shape: [n_samples, n_features]).
+
+        Returns:
+            np.ndarray: The mean log-likelihood under each mixture (shape: [n_mixtures]).
+        """
+        # Same precision and layout as DiagGMMScorer.score_samples
+        X = np.require(X, dtype=self.linear.dtype, requirements='C')
+        log_prob = X @ self.linear
+        log_prob += (X * X) @ self.quadratic
+        log_prob += self.constant
+
+        n_components = np.diff(self.bounds)
+        if np.all(n_components == n_components[0]):
+            # Same number of components in every mixture: reduce them all at once
+            log_prob = log_prob.reshape(X.shape[0], len(self.scorers), n_components[0])
+            log_max = log_prob.max(axis=2, keepdims=True)
+            log_prob -= log_max
+            np.exp(log_prob, out=log_prob)
+            log_likelihood = np.log(log_prob.sum(axis=2)) + log_max[:, :, 0]
+            return np.mean(log_likelihood, axis=0, dtype=np.float64)
+        return np.array([np.mean(_log_sum_exp(log_prob[:, start:end]), dtype=np.float64)
+                         for start, end in zip(self.bounds[:-1], self.bounds[1:])])
+
+
+def fit_diag_gmm(X, n_components, max_iter=100, tol=1e-3, reg_covar=1e-6, random_state=None):
+    """
+    Fit a Gaussian mixture with diagonal covariances using Expectation-Maximization.
+
+    Args:
+        X (array-like): The training data (shape: [n_samples, n_features]).
+        n_components (int): The number of mixture components.
+        max_iter (int): The maximum number of EM iterations.
+        tol (float): Convergence threshold on the change of the mean log-likelihood.
+        reg_covar (float): Non-negative regularization added to the covariances.
+        random_state (int or None): Seed for the k-means initialization.
+
+    Returns:
+        GaussianMixture: A fitted sklearn GaussianMixture with covariance_type='diag'.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    n_samples = X.shape[0]
+    X_squared = X * X
+
+    # Initialize the responsibilities from k-means labels, as GaussianMixture does by default
+    labels = KMeans(n_clusters=n_components, n_init=1, random_state=random_state).fit(X).labels_
+    resp = np.zeros((n_samples, n_components))
+    resp[np.arange(n_samples), labels] = 1
+    weights, means, covariances = _m_step(X, X_squared, resp, reg_covar)
+
+    lower_bound = -np.inf
+    converged = False
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        previous_lower_bound = lower_bound
+        lower_bound = _e_step(X, X_squared, weights, means, covariances, resp)
+        weights, means, covariances = _m_step(X, X_squared, resp, reg_covar)
+        if abs(lower_bound - previous_lower_bound) < tol:
+            converged = True
+            break
+
+    model = GaussianMixture(
+        n_components=n_components,
+        covariance_type='diag',
+        tol=tol,
+        reg_covar=reg_covar,
+        max_iter=max_iter,
+        random_state=random_state,
+    )
+    model.weights_ = weights
+    model.means_ = means
+    model.covariances_ = covariances
+    model.precisions_ = 1.0 / covariances
+    model.precisions_cholesky_ = 1.0 / np.sqrt(covariances)
+    model.converged_ = converged
+    model.n_iter_ = n_iter
+    model.lower_bound_ = lower_bound
+    model.n_features_in_ = X.shape[1]
+    return model
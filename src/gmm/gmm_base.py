@@ -1,6 +1,11 @@
 import pickle
 from abc import ABC, abstractmethod
 
+# Pickle protocol used to store models. Protocol 5 writes NumPy arrays (means, covariances,
+# precisions) straight from their buffers instead of copying them through bytes objects first.
+# Any protocol can be loaded, so models saved with older protocols still load.
+PICKLE_PROTOCOL = 5
+
 class GMMModelBase(ABC):
     """
     Abstract base class for the GMM model.
@@ -33,7 +38,7 @@ class GMMModelBase(ABC):
     def save(self, file_path):
         """Serialize and save the model."""
         with open(file_path, 'wb') as f:
-            pickle.dump(self.model, f)
+            pickle.dump(self.model, f, protocol=PICKLE_PROTOCOL)
 
     def load(self, file_path):
         """
@@ -1,9 +1,10 @@
 import sys
-from cli import main as cli_main  # Import the CLI entry point
-from web_gui import app as web_app  # Import the Flask app for the Web GUI
 import logging
 import json
 
+# The CLI and the Web GUI (Flask) are imported only in the branch that runs them, so
+# starting one does not pay for importing the other
+
 def load_config():
     """Load configuration settings (e.g., port, logging settings)."""
     with open('config.json', 'r') as config_file:
@@ -24,9 +25,13 @@ def main():
     # Determine execution mode (CLI or Web GUI)
     if len(sys.argv) > 1 and sys.argv[1] == 'cli':
         logging.info("Starting CLI interface...")
+        from cli import main as cli_main  # Import the CLI entry point
+
         cli_main()  # Run the CLI
     else:
         logging.info("Starting Web GUI...")
+        from web_gui import app as web_app  # Import the Flask app for the Web GUI
+
         web_app.run(host='0.0.0.0', port=config.get("port", 5000), debug=True)
 
 if __name__ == "__main__":
@@ -2,9 +2,10 @@
 
 # commands.py
 import os
-from service.speaker_enrollment import SpeakerEnrollment
-from service.speaker_recognition import SpeakerRecognition
-from file_management.file_management import FileManagementInterface
+from file_management.file_management import FileManagementInterface, file_id_for_path
+
+# SpeakerEnrollment and SpeakerRecognition pull in the feature extraction and GMM
+# stacks (librosa, scikit-learn), so they are imported only by the commands that use them.
 
 # Base Command class
 class Command:
@@ -31,6 +32,8 @@ class EnrollSpeakerCommand(Command):
 
     def execute(self):
         """Execute the enroll command by enrolling a new speaker."""
+        from service.speaker_enrollment import SpeakerEnrollment
+
         # Initialize SpeakerEnrollment with the provided parameters
         speaker_enrollment = SpeakerEnrollment(
             bst=self.bst, 
@@ -53,7 +56,10 @@ class EnrollSpeakerCommand(Command):
 
 # Command for recognizing a speaker
 class RecognizeSpeakerCommand(Command):
-    def __init__(self, bst, audio_file, base_directory, sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps):
+    def __init__(self, bst, audio_file, base_directory, sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps,
+                 max_frames=None):
+        from service.speaker_recognition import SpeakerRecognition
+
         self.audio_file = audio_file
         self.recognizer = SpeakerRecognition(
             bst=bst,
@@ -63,7 +69,8 @@ class RecognizeSpeakerCommand(Command):
             frame_step=frame_step,
             fft_size=fft_size,
             num_filters=num_filters,
-            num_ceps=num_ceps
+            num_ceps=num_ceps,
+            max_frames=max_frames
         )
 
     def execute(self):
@@ -78,10 +85,12 @@ class ListSpeakersCommand(Command):
 
     def execute(self):
         """Execute the list speakers command to display all speakers."""
-        speakers = self.file_management.list_all_files()
         print("Enrolled Speakers:")
-        for speaker in speakers:
-            print(f"- {speaker['file_id']}")
+        # Every enrolled speaker has one metadata/<speaker>_metadata.txt file
+        for metadata in self.file_management.iter_files_with_prefix("metadata" + os.sep):
+            file_name = os.path.basename(metadata['file_path'])
+            if file_name.endswith("_metadata.txt"):
+                print(f"- {file_name[:-len('_metadata.txt')]}")
 
 # Command for deleting a speaker
 class DeleteSpeakerCommand(Command):
@@ -91,7 +100,12 @@ class DeleteSpeakerCommand(Command):
 
     def execute(self):
         """Execute the delete command to remove a speaker."""
-        self.file_management.delete_file(self.speaker_name)
+        # Files are indexed by the ID of their path relative to the base directory, so derive
+        # them the same way enrollment stored the speaker's model and metadata (the metadata
+        # file is what ListSpeakersCommand lists)
+        for file_path in (os.path.join("models", f"{self.speaker_name}_gmm_model.pkl"),
+                          os.path.join("metadata", f"{self.speaker_name}_metadata.txt")):
+            self.file_management.delete_file(file_id_for_path(file_path))
         print(f"Speaker {self.speaker_name} deleted successfully.")
 
 # CommandHandler to execute the commands
@@ -30,7 +30,7 @@ class SpeakerEnrollment:
             frame_step (float): Frame step (overlap) in seconds.
             n_mixtures (int): Number of Gaussian mixtures in GMM.
         """
-        self.audio_extractor = AudioFeatureExtractor(
+        self.audio_extractor = AudioFeatureExtractor.get(
             sample_rate=sample_rate,
             frame_size=frame_size,
             frame_step=frame_step,
@@ -1,22 +1,73 @@
 # speaker_recognition.py
-import os
+import functools
 import hashlib
-from speaker_enrollment import AudioFeatureExtractor
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from feature_extraction.audio_feature_extractor import AudioFeatureExtractor
 from gmm.gmm_factory import GMMFactory
-from file_management.file_management import FileManagementInterface
+from gmm._diag_em import StackedDiagGMMScorer
+from file_management.file_management import FileManagementInterface, file_id_for_path
+
+
+@functools.lru_cache(maxsize=32)
+def _extract_features_cached(audio_extractor, wav_file_path, mtime_ns, size):
+    """
+    Extract the MFCC features of a .wav file, caching them by extractor, path, modification time and size.
+
+    Args:
+        audio_extractor (AudioFeatureExtractor): The extractor; AudioFeatureExtractor.get returns
+                                                 one instance per parameter set, so it keys the
+                                                 extraction parameters.
+        wav_file_path (str): The absolute path to the .wav file.
+        mtime_ns (int): The modification time of the file, in nanoseconds.
+        size (int): The size of the file in bytes.
+
+    Returns:
+        np.ndarray: The MFCC features, read-only since they are shared between calls.
+    """
+    signal = audio_extractor.load_wav(wav_file_path)
+    mfcc_features = audio_extractor.extract_features(signal)
+    mfcc_features.setflags(write=False)
+    return mfcc_features
+
 
 class SpeakerRecognition:
-    def __init__(self, bst, base_directory, sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps):
+    # Number of deserialized GMM models kept in memory between recognitions, as many as
+    # get_file_content keeps serialized ones
+    MODEL_CACHE_SIZE = 64
+    # Number of score vectors of the current set of models kept for repeated features
+    SCORE_CACHE_SIZE = 32
+
+    def __init__(self, bst, base_directory, sample_rate, frame_size, frame_step, fft_size, num_filters, num_ceps,
+                 max_frames=None):
         """
         Initialize a new SpeakerRecognition object.
         
         Args:
             file_manager: An instance responsible for managing file operations.
             gmm_factory: An instance responsible for creating GMM models.
+            max_frames (int or None): Score at most this many frames of an utterance, drawn at
+                                      random (with a fixed seed, so results are repeatable).
+                                      Scoring time is linear in the number of frames, and the
+                                      mean log-likelihood of a few hundred frames (several
+                                      seconds of speech) rarely changes which speaker wins;
+                                      short utterances, where every frame counts, are scored
+                                      whole. None (the default) scores every frame.
         """
-        self.audio_extractor = AudioFeatureExtractor(sample_rate=sample_rate, frame_size=frame_size, frame_step=frame_step, fft_size=fft_size, num_filters=num_filters, num_ceps=num_ceps)
+        self.audio_extractor = AudioFeatureExtractor.get(sample_rate=sample_rate, frame_size=frame_size, frame_step=frame_step, fft_size=fft_size, num_filters=num_filters, num_ceps=num_ceps)
         self.file_manager = FileManagementInterface(bst=bst, base_directory=base_directory)  
         self.gmm_factory = GMMFactory()
+        self.max_frames = max_frames
+        # file_id -> (serialized model, deserialized GMM model), least recently used first
+        self._model_cache = OrderedDict()
+        # Thread pool scoring the models, created on the first recognition with several models
+        self._executor = None
+        # Stacked scoring terms of the last set of diagonal models scored together
+        self._stacked_scorer = None
+        # Digest of the scored features -> scores under the stacked models, least recently used first
+        self._score_cache = OrderedDict()
 
     def recognize_speaker(self, wav_file_path):
         """
@@ -28,10 +79,16 @@ class SpeakerRecognition:
         Returns:
             str: The name or ID of the recognized speaker, or None if no match is found.
         """
-        # Step 1: Extract MFCC features from the audio file
+        # Step 1: Extract MFCC features from the audio file, or reuse them when the same
+        # unchanged file is recognized again (e.g. after enrolling more speakers)
         try:
-            signal = self.audio_extractor.load_wav(wav_file_path)
-            mfcc_features = self.audio_extractor.extract_features(signal)
+            wav_file_path = os.path.abspath(wav_file_path)
+            stat = os.stat(wav_file_path)
+            mfcc_features = _extract_features_cached(self.audio_extractor, wav_file_path,
+                                                     stat.st_mtime_ns, stat.st_size)
+            if self.max_frames is not None and len(mfcc_features) > self.max_frames:
+                rows = np.random.default_rng(0).choice(len(mfcc_features), self.max_frames, replace=False)
+                mfcc_features = mfcc_features[np.sort(rows)]
         except Exception as e:
             print(f"Error processing audio file: {e}")
             return None
@@ -42,12 +99,18 @@ class SpeakerRecognition:
             best_score = float('-inf')
             recognized_speaker = None
             
-            # Iterate over each GMM model stored in the models directory
-            for model_file in os.listdir(os.path.join(self.file_manager.base_directory, model_directory)):
+            # Iterate over each GMM model stored in the models directory. scandir reports the
+            # entry type from the directory listing, so other entries are skipped without a stat.
+            with os.scandir(os.path.join(self.file_manager.base_directory, model_directory)) as entries:
+                model_files = [entry.name for entry in entries
+                               if entry.name.endswith("_gmm_model.pkl") and entry.is_file()]
+            speakers = []
+            gmm_models = []
+            for model_file in model_files:
                 model_path = os.path.join(model_directory, model_file)
 
                 # Generate the file ID from the model path
-                file_id = hashlib.md5(model_path.encode()).hexdigest()
+                file_id = file_id_for_path(model_path)
                 
                 # Load the GMM model using the file_id
                 serialized_model = self.file_manager.get_file_content(file_id)
@@ -56,16 +119,17 @@ class SpeakerRecognition:
                     continue  # Skip this model if it couldn't be loaded
 
                 # Deserialize the GMM model
-                gmm_model = self.gmm_factory.create_gmm_model()
-                gmm_model.deserialize_model(serialized_model)
+                speakers.append(model_file[:-len("_gmm_model.pkl")])  # Strip the suffix the scan matched
+                gmm_models.append(self._load_model(file_id, serialized_model))
 
-                # Step 3: Calculate likelihood score for the extracted MFCC features
-                score = gmm_model.model.score(mfcc_features)  # Using GaussianMixture's score() method
-                
-                # Compare scores to find the best match
+            # Step 3: Calculate likelihood scores for the extracted MFCC features
+            scores = self._score_models(gmm_models, mfcc_features)
+
+            # Compare scores to find the best match
+            for speaker, score in zip(speakers, scores):
                 if score > best_score:
                     best_score = score
-                    recognized_speaker = model_file.split("_gmm_model.pkl")[0]  # Extract speaker name from the file name
+                    recognized_speaker = speaker
 
         except Exception as e:
             print(f"Error loading GMM models: {e}")
@@ -77,4 +141,87 @@ class SpeakerRecognition:
             return recognized_speaker
         else:
             print("No matching speaker found.")
-            return None
\ No newline at end of file
+            return None
+
+    def _score_models(self, gmm_models, mfcc_features):
+        """
+        Compute the mean log-likelihood of the MFCC features under each GMM model.
+
+        When every model has diagonal covariances (the default), their scoring terms are
+        stacked and all models are scored with one pair of matrix products; the stacked
+        terms are kept while the same models are loaded, and so are the scores of recently
+        scored features, so the same utterance checked again against the same speakers is
+        not scored twice. Otherwise the models are scored concurrently, since scoring is
+        BLAS-bound and releases the GIL.
+
+        Args:
+            gmm_models (list of GMMModelBase): The GMM models.
+            mfcc_features (np.ndarray): The MFCC features (shape: [num_frames, num_ceps]).
+
+        Returns:
+            iterable of float: The score of each model, in order.
+        """
+        if len(gmm_models) <= 1:
+            return [gmm_model.score(mfcc_features) for gmm_model in gmm_models]
+
+        scorers = [gmm_model.get_scorer() for gmm_model in gmm_models]
+        if any(scorer is None for scorer in scorers):
+            return self._get_executor().map(lambda gmm_model: gmm_model.score(mfcc_features), gmm_models)
+
+        if self._stacked_scorer is None or len(self._stacked_scorer.scorers) != len(scorers) or any(
+                cached is not scorer for cached, scorer in zip(self._stacked_scorer.scorers, scorers)):
+            self._stacked_scorer = StackedDiagGMMScorer(scorers)
+            self._score_cache.clear()
+
+        # Hashing the features is a single pass over them, much cheaper than scoring them
+        mfcc_features = np.ascontiguousarray(mfcc_features)
+        key = (mfcc_features.shape, mfcc_features.dtype.str,
+               hashlib.blake2b(mfcc_features, digest_size=16).digest())
+        scores = self._score_cache.get(key)
+        if scores is None:
+            scores = self._stacked_scorer.score(mfcc_features).tolist()
+            self._score_cache[key] = scores
+            if len(self._score_cache) > self.SCORE_CACHE_SIZE:
+                self._score_cache.popitem(last=False)
+        else:
+            self._score_cache.move_to_end(key)
+        return scores
+
+    def _get_executor(self):
+        """
+        Return the thread pool used to score the models, creating it on first use.
+
+        Returns:
+            ThreadPoolExecutor: The thread pool, reused across recognitions.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        return self._executor
+
+    def _load_model(self, file_id, serialized_model):
+        """
+        Return the GMM model for a serialized model, reusing the one deserialized last time.
+
+        get_file_content returns the same bytes object for a model file whose modification
+        time and size did not change, so a cached model is reused while its serialized form
+        is that very object; a rewritten model file yields new bytes and is deserialized again.
+
+        Args:
+            file_id (str): The file ID of the model.
+            serialized_model (bytes): The serialized GMM model.
+
+        Returns:
+            GMMModelBase: The deserialized GMM model.
+        """
+        cached = self._model_cache.get(file_id)
+        if cached is not None and cached[0] is serialized_model:
+            self._model_cache.move_to_end(file_id)
+            return cached[1]
+
+        gmm_model = self.gmm_factory.create_gmm_model()
+        gmm_model.deserialize_model(serialized_model)
+        self._model_cache[file_id] = (serialized_model, gmm_model)
+        self._model_cache.move_to_end(file_id)
+        if len(self._model_cache) > self.MODEL_CACHE_SIZE:
+            self._model_cache.popitem(last=False)
+        return gmm_model
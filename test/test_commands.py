@@ -0,0 +1,53 @@
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Insert the src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from file_management.bst import BinarySearchTree
+from file_management.file_management import FileManagementInterface
+from service.commands import DeleteSpeakerCommand, ListSpeakersCommand
+
+
+class TestSpeakerCommands(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for subdirectory in ("models", "metadata"):
+            os.makedirs(os.path.join(self.directory, subdirectory))
+        self.file_management = FileManagementInterface(
+            BinarySearchTree(os.path.join(self.directory, 'bst.pkl')), self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def enroll(self, speaker_name):
+        # The files SpeakerEnrollment.enroll_speaker writes, without training a model
+        self.file_management.add_file(os.path.join("models", f"{speaker_name}_gmm_model.pkl"), b"model")
+        self.file_management.add_file(os.path.join("metadata", f"{speaker_name}_metadata.txt"),
+                                      f"Speaker: {speaker_name}")
+
+    def list_speakers(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            ListSpeakersCommand(self.file_management).execute()
+        return sorted(line[2:] for line in output.getvalue().splitlines() if line.startswith("- "))
+
+    def test_delete_then_list(self):
+        self.enroll("alice")
+        self.enroll("bob")
+        self.assertEqual(self.list_speakers(), ["alice", "bob"])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            DeleteSpeakerCommand("bob", self.file_management).execute()
+
+        self.assertEqual(self.list_speakers(), ["alice"])
+        self.assertEqual(os.listdir(os.path.join(self.directory, "models")), ["alice_gmm_model.pkl"])
+
+
+if __name__ == '__main__':
+    unittest.main()
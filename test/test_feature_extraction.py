@@ -0,0 +1,236 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import soundfile as sf
+from scipy.fftpack import dct
+
+# Insert the src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from feature_extraction.dct_processor import DCTProcessor
+from feature_extraction.framing import Framing
+from feature_extraction.pre_emphasis import PreEmphasisFilter
+from feature_extraction.audio_feature_extractor import AudioFeatureExtractor
+from feature_extraction.mel_filterbank import MelScaleFilterbank
+
+
+class TestPreEmphasisFilter(unittest.TestCase):
+    def test_matches_difference_equation(self):
+        """
+        Test that the filter computes y[t] = x[t] - alpha * x[t-1].
+        """
+        signal = [0.1, 0.2, 0.4, 0.5, 0.3, 0.2]
+        output = PreEmphasisFilter(alpha=0.97).apply_filter(signal)
+
+        expected = [signal[0]] + [signal[i] - 0.97 * signal[i - 1] for i in range(1, len(signal))]
+        np.testing.assert_allclose(output, expected)
+
+    def test_integer_signal(self):
+        output = PreEmphasisFilter(alpha=0.5).apply_filter(np.array([2, 4, 6]))
+        np.testing.assert_allclose(output, [2.0, 3.0, 4.0])
+        self.assertEqual(output.dtype, np.float32)
+
+    def test_empty_signal(self):
+        self.assertEqual(PreEmphasisFilter().apply_filter([]).size, 0)
+
+
+class TestDCTProcessor(unittest.TestCase):
+    def test_basis_matches_scipy_dct(self):
+        """
+        Test that the precomputed DCT-II basis matches scipy's orthonormal DCT.
+        """
+        log_mel_spectrum = np.random.default_rng(0).random((10, 26))
+        dct_processor = DCTProcessor(num_ceps=13, num_filters=26)
+
+        expected = dct(log_mel_spectrum, type=2, axis=1, norm='ortho')[:, :13]
+        np.testing.assert_allclose(dct_processor.compute_dct(log_mel_spectrum), expected, atol=1e-5)
+
+    def test_num_ceps_larger_than_num_filters(self):
+        log_mel_spectrum = np.random.default_rng(1).random((2, 4))
+        dct_processor = DCTProcessor(num_ceps=13, num_filters=4)
+
+        self.assertEqual(dct_processor.compute_dct(log_mel_spectrum).shape, (2, 4))
+
+    def test_basis_follows_input_width(self):
+        """
+        Test that the basis is built for the width of the input, as scipy's DCT was applied.
+        """
+        for dct_processor in (DCTProcessor(num_ceps=13), DCTProcessor(num_ceps=13, num_filters=26)):
+            for num_filters in (40, 26):
+                log_mel_spectrum = np.random.default_rng(num_filters).random((3, num_filters))
+                expected = dct(log_mel_spectrum, type=2, axis=1, norm='ortho')[:, :13]
+                np.testing.assert_allclose(dct_processor.compute_dct(log_mel_spectrum), expected, atol=1e-5)
+
+
+def baseline_frames(signal, frame_length, frame_step):
+    """
+    Frame a signal the way the original list-based Framing.frame_signal did, zero-padding the end.
+    """
+    num_frames = max(0, int(np.ceil(float(len(signal) - frame_length) / frame_step)) + 1)
+    padded = np.concatenate((signal, np.zeros(num_frames * frame_step + frame_length)))
+    return np.array([padded[i * frame_step:i * frame_step + frame_length] for i in range(num_frames)],
+                    dtype=np.float32).reshape(num_frames, frame_length)
+
+
+class TestFraming(unittest.TestCase):
+    def test_numpy_framing_matches_baseline(self):
+        """
+        Test the NumPy framing path (sliding window view plus padded tail) against the original
+        framing, including signals with no frames and rates whose frames are not 64-byte multiples.
+        """
+        with mock.patch('feature_extraction.framing.frame_window', None):
+            for sample_rate, lengths in ((16000, (0, 200, 240, 241, 400, 1000, 16080)),
+                                         (8000, (0, 119, 120, 121, 200, 3001))):
+                framing = Framing(0.025, 0.01, sample_rate)
+                window = np.hamming(framing.frame_length).astype(np.float32)
+                for length in lengths:
+                    signal = np.random.default_rng(length).standard_normal(length).astype(np.float32)
+                    expected = baseline_frames(signal, framing.frame_length, framing.frame_step_length)
+
+                    np.testing.assert_array_equal(framing.frame_signal(signal), expected)
+                    np.testing.assert_allclose(framing.frame_signal(signal, window=window), expected * window,
+                                               atol=1e-6)
+
+    def test_iter_frames_matches_frame_signal(self):
+        framing = Framing(0.025, 0.01, 16000)
+        window = np.hamming(400).astype(np.float32)
+        for length in (16000, 16080, 1000):
+            signal = np.random.default_rng(length).standard_normal(length).astype(np.float32)
+            batches = list(framing.iter_frames(signal, batch_size=7, window=window))
+
+            self.assertTrue(all(len(batch) <= 7 for batch in batches))
+            np.testing.assert_array_equal(np.concatenate(batches), framing.frame_signal(signal, window=window))
+
+    def test_remove_dc(self):
+        framing = Framing(0.025, 0.01, 16000)
+        window = np.hamming(400).astype(np.float32)
+        signal = np.random.default_rng(2).standard_normal(16080).astype(np.float32) + 0.5
+
+        frames = framing.frame_signal(signal, remove_dc=True)
+        np.testing.assert_allclose(frames.mean(axis=1), 0.0, atol=1e-6)
+        np.testing.assert_allclose(framing.frame_signal(signal, window=window, remove_dc=True), frames * window,
+                                   atol=1e-6)
+
+class TestMelScaleFilterbank(unittest.TestCase):
+    def test_import_does_not_load_librosa_or_matplotlib(self):
+        """
+        Test that importing the filterbank module leaves librosa and matplotlib unimported.
+        """
+        src_directory = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]); "
+            "import feature_extraction.mel_filterbank; "
+            "print(sorted(m for m in ('librosa', 'matplotlib') if m in sys.modules))"
+        )
+        output = subprocess.run([sys.executable, '-c', code, src_directory],
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '[]')
+
+    def test_unusable_cache_directory_falls_back_to_computing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            not_a_directory = os.path.join(directory, 'data')
+            open(not_a_directory, 'w').close()
+            filterbank = MelScaleFilterbank(16000, 26, 512, cache_directory=os.path.join(not_a_directory, 'mel'))
+            expected = MelScaleFilterbank(16000, 26, 512, cache_directory=None)
+
+            np.testing.assert_array_equal(filterbank.filterbank, expected.filterbank)
+            self.assertEqual(os.listdir(directory), ['data'])
+
+class TestAudioFeatureExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = AudioFeatureExtractor()
+        self.signal = (np.random.default_rng(2).standard_normal(16000) * 0.1).astype(np.float32)
+
+    def test_fused_framing_matches_separate_stages(self):
+        """
+        Test that the fused pre-emphasis/framing/window step matches running the stages one by one.
+        """
+        for signal in (self.signal, self.signal[:1000]):
+            fused = self.extractor._emphasize_and_frame(signal)
+            staged = self.extractor._build_frames(self.extractor.pre_emphasis_filter.apply_filter(signal))
+            np.testing.assert_allclose(fused, staged, atol=1e-6)
+
+    def test_numpy_fused_framing_matches_separate_stages(self):
+        """
+        Test the NumPy fallback of the fused step against pre-emphasis followed by the original framing.
+        """
+        with mock.patch('feature_extraction.framing.frame_window', None), \
+                mock.patch('feature_extraction.audio_feature_extractor.emphasize_frame_window', None):
+            for signal in (self.signal, self.signal[:1000], self.signal[:240], self.signal[:0]):
+                emphasized = self.extractor.pre_emphasis_filter.apply_filter(signal)
+                expected = baseline_frames(emphasized, 400, 160) * self.extractor._window
+                np.testing.assert_allclose(self.extractor._emphasize_and_frame(signal), expected, atol=1e-6)
+
+    def test_stream_matches_offline_extraction(self):
+        """
+        Test that feeding the signal in uneven chunks yields the same frames as the offline path.
+        """
+        offline = self.extractor.extract_features(self.signal)
+        chunks = np.split(self.signal, [100, 3000, 3001, 9000, 12345])
+        streamed = np.concatenate([self.extractor.extract_features_stream(chunk) for chunk in chunks])
+
+        self.assertEqual(streamed.shape, (offline.shape[0] - 1, offline.shape[1]))
+        np.testing.assert_allclose(streamed, offline[:len(streamed)], atol=1e-4)
+
+        self.extractor.reset_stream()
+        restarted = self.extractor.extract_features_stream(self.signal, copy=False)
+        np.testing.assert_allclose(restarted, streamed, atol=1e-4)
+        self.assertIsNotNone(restarted.base)
+
+    def test_stream_scales_integer_pcm(self):
+        pcm = np.round(self.signal * 32767).astype(np.int16)
+        expected = self.extractor.extract_features_stream(pcm.astype(np.float32) / 32768)
+        self.extractor.reset_stream()
+        np.testing.assert_allclose(self.extractor.extract_features_stream(pcm), expected, atol=1e-4)
+
+    def test_iter_wav_features_matches_offline_extraction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'signal.wav')
+            sf.write(filepath, self.signal, 16000, subtype='FLOAT')
+            offline = self.extractor.extract_features(self.signal)
+            streamed = np.concatenate(list(self.extractor.iter_wav_features(filepath, block_seconds=0.3)))
+
+        self.assertEqual(streamed.shape, (offline.shape[0] - 1, offline.shape[1]))
+        np.testing.assert_allclose(streamed, offline[:len(streamed)], atol=1e-4)
+
+    def test_extract_features_shape(self):
+        mfcc_features = self.extractor.extract_features(self.signal)
+        self.assertEqual(mfcc_features.shape, (99, 13))
+        self.assertEqual(mfcc_features.dtype, np.float32)
+
+    def test_batch_matches_per_signal_extraction(self):
+        signals = [self.signal, self.signal[:1000], self.signal[5000:12000]]
+        batch = self.extractor.extract_features_batch(signals)
+
+        self.assertEqual(len(batch), len(signals))
+        for signal, mfcc_features in zip(signals, batch):
+            np.testing.assert_allclose(mfcc_features, self.extractor.extract_features(signal), atol=1e-4)
+
+    def test_batch_without_numba_kernels(self):
+        """
+        Test the batch path on the NumPy stages, where each signal is framed into a row slice
+        of the shared buffer that is not 64-byte aligned at 8 kHz (200-sample rows).
+        """
+        with mock.patch('feature_extraction.framing.frame_window', None), \
+                mock.patch('feature_extraction.audio_feature_extractor.emphasize_frame_window', None):
+            extractor = AudioFeatureExtractor(sample_rate=8000, use_cuda=False)
+            signals = [self.signal[:3000], self.signal[:100], self.signal[:5001]]
+            batch = extractor.extract_features_batch(signals)
+
+            self.assertEqual([len(mfcc_features) for mfcc_features in batch], [36, 0, 62])
+            for signal, mfcc_features in zip(signals, batch):
+                np.testing.assert_allclose(mfcc_features, extractor.extract_features(signal), atol=1e-4)
+
+    def test_get_returns_cached_extractor(self):
+        extractor = AudioFeatureExtractor.get(num_filters=40)
+        self.assertIs(AudioFeatureExtractor.get(num_filters=40), extractor)
+        self.assertIsNot(AudioFeatureExtractor.get(num_filters=26), extractor)
+        self.assertFalse(extractor._mel.flags.writeable)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,18 @@
+import hashlib
 import os
 import sys
 import time
 import shutil
+import tempfile
 import unittest
 
 # Insert the parent directory of the configmap package to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from file_management.bst import BinarySearchTree
-from file_management.file_management import FileManagementInterface
+from file_management.file_management import FileManagementInterface, file_id_for_path
+from file_management.sorted_index import SortedFileIndex
+from file_management.file_index import open_file_index
 
 
 class TestFileManagementInterface(unittest.TestCase):
@@ -91,5 +95,100 @@ class TestFileManagementInterface(unittest.TestCase):
         self.assertEqual(metadata["creation_date"], int(time.time()))
         self.assertEqual(metadata["description"], f"Added file at {os.path.join(self.base_directory, file_path)}")
 
+    def test_iter_files_with_prefix(self):
+        os.makedirs(os.path.join(self.base_directory, "metadata"))
+        self.fmi.add_file(os.path.join("metadata", "alice_metadata.txt"), "Speaker: alice")
+        self.fmi.add_file("metadata_notes.txt", "not in the folder")
+        files = list(self.fmi.iter_files_with_prefix("metadata" + os.sep))
+        self.assertEqual([f["file_path"] for f in files],
+                         [os.path.join(self.base_directory, "metadata", "alice_metadata.txt")])
+
+class TestFileIdForPath(unittest.TestCase):
+    def test_matches_md5_of_path(self):
+        """
+        Test that file IDs stay the md5 of the relative path, so existing indexes keep working.
+        """
+        for file_path in ('models/alice.pkl', 'models/bob.pkl', 'models/deep/carol.npy', 'readme.txt', ''):
+            self.assertEqual(file_id_for_path(file_path), hashlib.md5(file_path.encode()).hexdigest())
+
+class TestBinarySearchTree(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.bst = BinarySearchTree(os.path.join(self.directory, 'bst.pkl'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_bulk_insert_builds_balanced_tree(self):
+        self.bst.insert(500, 0, '/files/old')
+        self.bst.bulk_insert({'file_id': i, 'file_timestamp': i, 'file_path': f'/files/{i}'} for i in range(1000))
+
+        def depth(node):
+            return 0 if node is None else 1 + max(depth(node.left), depth(node.right))
+
+        self.assertEqual([node.file_id for node in self.bst.in_order()], list(range(1000)))
+        self.assertEqual(depth(self.bst.root), 10)
+        self.assertEqual(self.bst.search(500).file_path, '/files/500')
+        self.assertTrue(self.bst.dirty)
+
+class TestSortedFileIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.index_file = os.path.join(self.directory, 'index.pkl')
+        self.index = SortedFileIndex(self.index_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_matches_binary_search_tree(self):
+        """
+        Test that inserts, updates, deletes and lookups behave like the BST and survive a save/load.
+        """
+        bst = BinarySearchTree(os.path.join(self.directory, 'bst.pkl'))
+        file_ids = ['d41d8', '0cc17', 'f00ba', '9e107', '0cc17']
+        for timestamp, file_id in enumerate(file_ids):
+            self.index.insert(file_id, timestamp, f"/files/{file_id}")
+            bst.insert(file_id, timestamp, f"/files/{file_id}")
+        self.index.delete_node('f00ba')
+        bst.delete_node('f00ba')
+
+        self.assertEqual([n.file_id for n in self.index.in_order()], [n.file_id for n in bst.in_order()])
+        self.assertEqual(self.index.search('0cc17').file_timestamp, 4)
+        self.assertIsNone(self.index.search('f00ba'))
+
+        self.index.serialize_bst()
+        reloaded = SortedFileIndex(self.index_file)
+        self.assertEqual(reloaded.keys, ['0cc17', '9e107', 'd41d8'])
+        self.assertEqual(reloaded.search('9e107').file_path, '/files/9e107')
+
+    def test_backends_store_the_same_metadata(self):
+        """
+        Test that both index backends store every field of a record and read it back after a save/load.
+        """
+        record = dict(file_id='9e107', file_timestamp=1, file_path='/files/9e107', file_size=5,
+                      file_type='pkl', access_frequency=2, version='v1', permissions='rw',
+                      checksum='ck', creation_date=5, description='d')
+        fields = list(record) + ['speaker_name']
+        for kind in ('bst', 'sorted'):
+            index_file = os.path.join(self.directory, f'{kind}.pkl')
+            index = open_file_index(kind, index_file)
+            index.insert(**record)
+            index.serialize_bst()
+
+            node = open_file_index(kind, index_file).search('9e107')
+            self.assertEqual({field: getattr(node, field) for field in fields},
+                             dict(record, speaker_name=None), kind)
+
+    def test_open_file_index_shares_the_index_file(self):
+        bst = open_file_index('bst', self.index_file)
+        bst.insert('9e107', 1, '/files/9e107')
+        bst.serialize_bst()
+
+        index = open_file_index('sorted', self.index_file)
+        self.assertIsInstance(index, SortedFileIndex)
+        self.assertEqual(index.search('9e107').file_path, '/files/9e107')
+        with self.assertRaises(ValueError):
+            open_file_index('btree', self.index_file)
+
 if __name__ == '__main__':
     unittest.main()
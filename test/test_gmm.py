@@ -0,0 +1,51 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+from sklearn.mixture import GaussianMixture
+
+# Insert the src directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from gmm._diag_em import DiagGMMScorer, StackedDiagGMMScorer, fit_diag_gmm
+
+
+class TestDiagEM(unittest.TestCase):
+    def test_matches_sklearn(self):
+        """
+        Test that the diagonal EM converges to the same mixture as sklearn from the same initialization.
+        """
+        rng = np.random.default_rng(0)
+        data = rng.standard_normal((3000, 13))
+        data[:1000] += 2
+
+        expected = GaussianMixture(8, covariance_type='diag', max_iter=100, random_state=0).fit(data)
+        model = fit_diag_gmm(data, 8, max_iter=100, random_state=0)
+
+        self.assertEqual(model.n_iter_, expected.n_iter_)
+        np.testing.assert_allclose(model.means_, expected.means_, atol=1e-8)
+        np.testing.assert_allclose(model.covariances_, expected.covariances_, atol=1e-8)
+        np.testing.assert_allclose(model.score(data), expected.score(data))
+        np.testing.assert_array_equal(model.predict(data), expected.predict(data))
+
+    def test_scorer_matches_sklearn(self):
+        data = np.random.default_rng(1).standard_normal((2000, 13))
+        model = GaussianMixture(4, covariance_type='diag', random_state=0).fit(data)
+        scorer = DiagGMMScorer(model)
+
+        np.testing.assert_allclose(scorer.score_samples(data), model.score_samples(data))
+        self.assertAlmostEqual(scorer.score(data), model.score(data))
+
+    def test_stacked_scorer_matches_per_model_scores(self):
+        rng = np.random.default_rng(2)
+        data = rng.standard_normal((1000, 13))
+        for n_components in ((4, 4, 4), (4, 2, 8)):
+            scorers = [DiagGMMScorer(GaussianMixture(k, covariance_type='diag', random_state=i).fit(data + i))
+                       for i, k in enumerate(n_components)]
+            expected = [scorer.score(data) for scorer in scorers]
+            np.testing.assert_allclose(StackedDiagGMMScorer(scorers).score(data), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
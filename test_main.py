@@ -1,16 +1,13 @@
 import os
-from src.speaker_enrollment import SpeakerEnrollment
+from src.service.speaker_enrollment import SpeakerEnrollment
+from src.service.speaker_recognition import SpeakerRecognition
 from src.file_management.bst import BinarySearchTree
 from src.file_management.file_management import FileManagementInterface
 
 def setup_environment(base_directory):
     # Ensure the base directory for models and metadata exists
-    if not os.path.exists(os.path.join(base_directory, "models")):
-        os.makedirs(os.path.join(base_directory, "models"))
-    if not os.path.exists(os.path.join(base_directory, "audio_files")):
-        os.makedirs(os.path.join(base_directory, "audio_files"))
-    if not os.path.exists(os.path.join(base_directory, "metadata")):
-        os.makedirs(os.path.join(base_directory, "metadata"))
+    for subdirectory in ("models", "audio_files", "metadata"):
+        os.makedirs(os.path.join(base_directory, subdirectory), exist_ok=True)
     print(f"Test environment set up at {base_directory}")
 
 def test_speaker_enrollment():
@@ -96,7 +93,17 @@ def test_speaker_enrollment():
     # Step 4: Test speaker recognition
     test_wav_file ="/home/gena/PROJECTS/voice-recognition-engine/audio_files/maria_recognize.wav"
     speaker_name = "maria_speaker"
-    recognized_speaker = speaker_enrollment.recognize_speaker(test_wav_file)
+    speaker_recognition = SpeakerRecognition(
+        bst=bst,
+        base_directory=base_directory,
+        sample_rate=16000,
+        frame_size=0.025,
+        frame_step=0.01,
+        fft_size=512,
+        num_filters=26,
+        num_ceps=13
+    )
+    recognized_speaker = speaker_recognition.recognize_speaker(test_wav_file)
     
     if recognized_speaker == speaker_name:
         print("Speaker recognition test passed.")